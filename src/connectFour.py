@@ -1,8 +1,17 @@
-import numpy as np
 import pygame
+import argparse
+import json
+import os
 import sys
 import math
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from connectFourEngine import ROW_COUNT, COLUMN_COUNT, CONNECT, STANDARD, Position, Searcher, ParallelSearcher, SearchTimeout, get_geometry
+from connectFourBook import OpeningBook
+from connectFourSolver import Solver
 
 # Colors
 BLUE = (0,0,255)
@@ -11,64 +20,110 @@ RED = (255,0,0)
 YELLOW = (255,255,0)
 WHITE = (255, 255, 255)
 
-# Board size
-ROW_COUNT = 6
-COLUMN_COUNT = 7
-
-pygame.init()
+# Board shape; --rows, --columns and --connect pick another one through configure_board
+geometry = STANDARD
 
-SQUARESIZE = 100
+MAX_SQUARESIZE = 100
+SQUARESIZE = MAX_SQUARESIZE
 width = COLUMN_COUNT * SQUARESIZE
 height = (ROW_COUNT+1) * SQUARESIZE
 size = (width, height)
-RADIUS = int(SQUARESIZE/2 - 5)
-
-screen = pygame.display.set_mode(size)
-pygame.display.set_caption("Connect Four - Single Player")
-
-myfont = pygame.font.SysFont("monospace", 75)
-menu_font = pygame.font.SysFont("monospace", 50)
+RADIUS = int(SQUARESIZE * 0.45)
+
+FPS = 60
+AI_MOVE_DELAY = 500  # ms
+
+# Seconds the hard AI may spend per move; deeper iterations are searched while time remains
+HARD_TIME_BUDGET = 1.0
+
+# The hard AI switches to the exact solver once fewer cells than this are empty
+SOLVER_EMPTY_THRESHOLD = 20
+
+# Seconds the perfect AI gives the solver before falling back to the hard AI
+PERFECT_TIME_BUDGET = 5.0
+# The perfect AI only tries the solver once fewer cells than this are empty; with more it rarely
+# finishes within PERFECT_TIME_BUDGET, so those moves go straight to the hard AI's search
+PERFECT_EMPTY_THRESHOLD = 28
+
+# The hard AI searches the player's possible replies while they think; --no-ponder turns this off
+PONDER = True
+
+# Processes used by the hard AI's root-parallel search; 1 keeps the search in-process
+AI_WORKERS = int(os.environ.get("CONNECT_FOUR_WORKERS", "1"))
+
+# Per-move search statistics as JSON lines; enabled by --stats PATH or CONNECT_FOUR_STATS=PATH
+stats_log = None
+last_move_source = None
+
+# Memory-mapped once; the hard AI plays book moves instantly and searches after leaving the book
+opening_book = OpeningBook.open()
+
+# Exact scores do not depend on how a position was reached, so one solver table serves every game;
+# created on first use so search worker processes that re-import this module skip the allocation
+solver = None
+
+screen = None
+myfont = None
+menu_font = None
+status_font = None
+
+def configure_board(rows, columns, connect):
+    global ROW_COUNT, COLUMN_COUNT, CONNECT, geometry
+    ROW_COUNT, COLUMN_COUNT, CONNECT = rows, columns, connect
+    geometry = get_geometry(rows, columns, connect)
+    set_square_size(MAX_SQUARESIZE)
+
+def set_square_size(square_size):
+    global SQUARESIZE, width, height, size, RADIUS
+    SQUARESIZE = square_size
+    width = COLUMN_COUNT * SQUARESIZE
+    height = (ROW_COUNT+1) * SQUARESIZE
+    size = (width, height)
+    RADIUS = int(SQUARESIZE * 0.45)
+
+def fit_to_screen():
+    # Shrinks the squares until the board plus the drop row fits the desktop, leaving room for window decorations
+    info = pygame.display.Info()
+    if info.current_w <= 0 or info.current_h <= 0:
+        return
+    square_size = min(MAX_SQUARESIZE, info.current_w * 95 // 100 // COLUMN_COUNT, info.current_h * 90 // 100 // (ROW_COUNT+1))
+    set_square_size(max(square_size, 10))
+
+def init_display():
+    # Not done at import time: search worker processes re-import this module and must not open windows
+    global screen, myfont, menu_font, status_font
+    pygame.init()
+    fit_to_screen()
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption(f"{game_title()} - Single Player")
+
+    myfont = pygame.font.SysFont("monospace", 75)
+    menu_font = pygame.font.SysFont("monospace", 50)
+    status_font = pygame.font.SysFont("monospace", 40)
+
+def game_title():
+    return "Connect Four" if CONNECT == 4 else f"Connect {CONNECT}"
 
 def create_board():
-    return np.zeros((ROW_COUNT,COLUMN_COUNT))
+    return Position(geometry)
 
-def drop_piece(board, row, col, piece):
-    board[row][col] = piece
+def drop_piece(board, col):
+    board.make_move(col)
 
 def is_valid_location(board, col):
-    return board[ROW_COUNT-1][col] == 0
+    return board.is_valid_location(col)
 
 def get_next_open_row(board, col):
-    for r in range(ROW_COUNT):
-        if board[r][col] == 0:
-            return r
+    return board.get_next_open_row(col)
 
 def winning_move(board, piece):
-    # Horizontal check
-    for c in range(COLUMN_COUNT-3):
-        for r in range(ROW_COUNT):
-            if board[r][c] == piece and board[r][c+1] == piece and board[r][c+2] == piece and board[r][c+3] == piece:
-                return True
+    return board.winning_move(piece)
 
-    # Vertical check
-    for c in range(COLUMN_COUNT):
-        for r in range(ROW_COUNT-3):
-            if board[r][c] == piece and board[r+1][c] == piece and board[r+2][c] == piece and board[r+3][c] == piece:
-                return True
-
-    # Positive diagonal
-    for c in range(COLUMN_COUNT-3):
-        for r in range(ROW_COUNT-3):
-            if board[r][c] == piece and board[r+1][c+1] == piece and board[r+2][c+2] == piece and board[r+3][c+3] == piece:
-                return True
-
-    # Negative diagonal
-    for c in range(COLUMN_COUNT-3):
-        for r in range(3, ROW_COUNT):
-            if board[r][c] == piece and board[r-1][c+1] == piece and board[r-2][c+2] == piece and board[r-3][c+3] == piece:
-                return True
+def winning_move_at(board, col):
+    return board.winning_move_at(col)
 
 def draw_board(board):
+    grid = board.to_grid()
     for c in range(COLUMN_COUNT):
         for r in range(ROW_COUNT):
             pygame.draw.rect(screen, BLUE, (c*SQUARESIZE, r*SQUARESIZE+SQUARESIZE, SQUARESIZE, SQUARESIZE))
@@ -76,25 +131,27 @@ def draw_board(board):
 
     for c in range(COLUMN_COUNT):
         for r in range(ROW_COUNT):        
-            if board[r][c] == 1:
+            if grid[r][c] == 1:
                 pygame.draw.circle(screen, RED, (int(c*SQUARESIZE+SQUARESIZE/2), height-int(r*SQUARESIZE+SQUARESIZE/2)), RADIUS)
-            elif board[r][c] == 2: 
+            elif grid[r][c] == 2: 
                 pygame.draw.circle(screen, YELLOW, (int(c*SQUARESIZE+SQUARESIZE/2), height-int(r*SQUARESIZE+SQUARESIZE/2)), RADIUS)
     pygame.display.update()
 
 def draw_menu():
     screen.fill(BLACK)
-    title = myfont.render("Connect Four", True, WHITE)
+    title = myfont.render(game_title(), True, WHITE)
     easy_text = menu_font.render("Easy", True, WHITE)
     medium_text = menu_font.render("Medium", True, WHITE)
     hard_text = menu_font.render("Hard", True, WHITE)
+    perfect_text = menu_font.render("Perfect", True, WHITE)
     quit_text = menu_font.render("Quit", True, WHITE)
 
     screen.blit(title, (width//2 - title.get_width()//2, height//6))
     screen.blit(easy_text, (width//2 - easy_text.get_width()//2, height//3))
     screen.blit(medium_text, (width//2 - medium_text.get_width()//2, height//3 + 60))
     screen.blit(hard_text, (width//2 - hard_text.get_width()//2, height//3 + 120))
-    screen.blit(quit_text, (width//2 - quit_text.get_width()//2, height//3 + 180))
+    screen.blit(perfect_text, (width//2 - perfect_text.get_width()//2, height//3 + 180))
+    screen.blit(quit_text, (width//2 - quit_text.get_width()//2, height//3 + 240))
     pygame.display.update()
 
 def draw_endgame_menu(winner):
@@ -110,198 +167,243 @@ def draw_endgame_menu(winner):
     pygame.display.update()
 
 def ai_move_easy(board):
-    valid_cols = [c for c in range(COLUMN_COUNT) if is_valid_location(board, c)]
+    valid_cols = board.get_valid_locations()
     return random.choice(valid_cols)
 
 def ai_move_medium(board):
+    piece = board.piece_to_move
+    opp_piece = 1 if piece == 2 else 2
+
     # Try to win next move
-    for col in range(COLUMN_COUNT):
-        if is_valid_location(board, col):
-            row = get_next_open_row(board, col)
-            temp_board = board.copy()
-            drop_piece(temp_board, row, col, 2)
-            if winning_move(temp_board, 2):
-                return col
+    for col in board.get_valid_locations():
+        if board.is_winning_drop(col, piece):
+            return col
 
     # Block opponent's winning move
-    for col in range(COLUMN_COUNT):
-        if is_valid_location(board, col):
-            row = get_next_open_row(board, col)
-            temp_board = board.copy()
-            drop_piece(temp_board, row, col, 1)
-            if winning_move(temp_board, 1):
-                return col
+    for col in board.get_valid_locations():
+        if board.is_winning_drop(col, opp_piece):
+            return col
 
     # Otherwise pick random
     return ai_move_easy(board)
 
-def ai_move_hard(board):
-    def score_position(board, piece):
-        score = 0
-        center_array = [int(i) for i in list(board[:, COLUMN_COUNT//2])]
-        center_count = center_array.count(piece)
-        score += center_count * 3
+def book_move(board):
+    global last_move_source
+    if opening_book is not None and board.geometry is STANDARD:
+        col = opening_book.lookup(board)
+        if col is not None:
+            last_move_source = "book"
+        return col
+    return None
+
+def solve_move(board, time_budget, searcher=None):
+    global solver, last_move_source
+    if board.geometry is not STANDARD:
+        return None  # The solver's bitboard tricks assume the 6x7 board; other shapes always use the search
+    if solver is None:
+        solver = Solver()
+    stop_event = searcher.stop_event if searcher is not None else None
+    try:
+        col, score = solver.best_move(board, time_budget, stop_event)
+    except SearchTimeout:
+        return None
+    last_move_source = "solver"
+    return col
+
+def ai_move_hard(board, searcher=None, use_solver=True):
+    global last_move_source
+    col = book_move(board)
+    if col is None and use_solver and board.geometry.cells - len(board.moves) < SOLVER_EMPTY_THRESHOLD:
+        col = solve_move(board, HARD_TIME_BUDGET, searcher)
+
+    if col is None:
+        if searcher is None:
+            searcher = Searcher()
+        col, minimax_score = searcher.search(board, HARD_TIME_BUDGET)
+        last_move_source = "search"
+    return col
 
-        for r in range(ROW_COUNT):
-            row_array = [int(i) for i in list(board[r,:])]
-            for c in range(COLUMN_COUNT-3):
-                window = row_array[c:c+4]
-                score += evaluate_window(window, piece)
-
-        for c in range(COLUMN_COUNT):
-            col_array = [int(i) for i in list(board[:,c])]
-            for r in range(ROW_COUNT-3):
-                window = col_array[r:r+4]
-                score += evaluate_window(window, piece)
-
-        for r in range(ROW_COUNT-3):
-            for c in range(COLUMN_COUNT-3):
-                window = [board[r+i][c+i] for i in range(4)]
-                score += evaluate_window(window, piece)
-
-        for r in range(3, ROW_COUNT):
-            for c in range(COLUMN_COUNT-3):
-                window = [board[r-i][c+i] for i in range(4)]
-                score += evaluate_window(window, piece)
-
-        return score
-
-    def evaluate_window(window, piece):
-        score = 0
-        opp_piece = 1 if piece == 2 else 2
-
-        if window.count(piece) == 4:
-            score += 100
-        elif window.count(piece) == 3 and window.count(0) == 1:
-            score += 5
-        elif window.count(piece) == 2 and window.count(0) == 2:
-            score += 2
-
-        if window.count(opp_piece) == 3 and window.count(0) == 1:
-            score -= 4
-
-        return score
-
-    def is_terminal_node(board):
-        return winning_move(board, 1) or winning_move(board, 2) or len(get_valid_locations(board)) == 0
-
-    def get_valid_locations(board):
-        return [c for c in range(COLUMN_COUNT) if is_valid_location(board, c)]
-
-    def minimax(board, depth, alpha, beta, maximizingPlayer):
-        valid_locations = get_valid_locations(board)
-        is_terminal = is_terminal_node(board)
-
-        if depth == 0 or is_terminal:
-            if is_terminal:
-                if winning_move(board, 2):
-                    return (None, 100000000000000)
-                elif winning_move(board, 1):
-                    return (None, -10000000000000)
-                else:
-                    return (None, 0)
-            else:
-                return (None, score_position(board, 2))
-        if maximizingPlayer:
-            value = -math.inf
-            column = random.choice(valid_locations)
-            for col in valid_locations:
-                row = get_next_open_row(board, col)
-                temp_board = board.copy()
-                drop_piece(temp_board, row, col, 2)
-                new_score = minimax(temp_board, depth-1, alpha, beta, False)[1]
-                if new_score > value:
-                    value = new_score
-                    column = col
-                alpha = max(alpha, value)
-                if alpha >= beta:
-                    break
-            return column, value
-        else:
-            value = math.inf
-            column = random.choice(valid_locations)
-            for col in valid_locations:
-                row = get_next_open_row(board, col)
-                temp_board = board.copy()
-                drop_piece(temp_board, row, col, 1)
-                new_score = minimax(temp_board, depth-1, alpha, beta, True)[1]
-                if new_score < value:
-                    value = new_score
-                    column = col
-                beta = min(beta, value)
-                if alpha >= beta:
-                    break
-            return column, value
-
-    col, minimax_score = minimax(board, 4, -math.inf, math.inf, True)
+def ai_move_perfect(board, searcher=None):
+    # Tries the exact solver once it can usually finish, falling back to the hard AI's search when it cannot
+    # finish in time; a second, shorter solver run on the same position could not succeed either
+    col = book_move(board)
+    if col is None and board.geometry.cells - len(board.moves) < PERFECT_EMPTY_THRESHOLD:
+        col = solve_move(board, PERFECT_TIME_BUDGET, searcher)
+    if col is None:
+        col = ai_move_hard(board, searcher, use_solver=False)
     return col
 
+def create_searcher():
+    if AI_WORKERS > 1:
+        return ParallelSearcher(AI_WORKERS)
+    return Searcher()
+
+def should_ponder(board, difficulty, searcher):
+    # Only the hard AI's in-process search reuses pondered work; book and solver replies need none
+    if not PONDER or difficulty != 'Hard' or not isinstance(searcher, Searcher):
+        return False
+    ply = len(board.moves) + 1
+    if board.geometry is not STANDARD:
+        return True
+    if opening_book is not None and ply < opening_book.plies:
+        return False
+    return board.geometry.cells - ply >= SOLVER_EMPTY_THRESHOLD
+
+def choose_ai_move(board, difficulty, searcher):
+    global last_move_source
+    last_move_source = difficulty.lower()
+    start = time.perf_counter()
+
+    if difficulty == 'Easy':
+        col = ai_move_easy(board)
+    elif difficulty == 'Medium':
+        col = ai_move_medium(board)
+    elif difficulty == 'Perfect':
+        col = ai_move_perfect(board, searcher)
+    else:
+        col = ai_move_hard(board, searcher)
+
+    if stats_log is not None:
+        log_move_stats(board, difficulty, col, time.perf_counter() - start, searcher)
+    return col
+
+def open_stats_log(path):
+    global stats_log
+    stats_log = open(path, "a")
+
+def log_move_stats(board, difficulty, col, wall_time, searcher):
+    record = {
+        "difficulty": difficulty,
+        "ply": len(board.moves),
+        "column": col,
+        "source": last_move_source,
+        "wall_time": round(wall_time, 6),
+    }
+    if last_move_source == "search":
+        record.update(searcher.stats())
+    elif last_move_source == "solver":
+        record["nodes"] = solver.nodes
+    stats_log.write(json.dumps(record) + "\n")
+    stats_log.flush()
+
+def draw_thinking_indicator():
+    pygame.draw.rect(screen, BLACK, (0,0, width, SQUARESIZE))
+    dots = "." * (pygame.time.get_ticks() // 300 % 4)
+    thinking_text = status_font.render("Thinking" + dots, True, YELLOW)
+    screen.blit(thinking_text, (width//2 - status_font.size("Thinking...")[0]//2, SQUARESIZE//2 - thinking_text.get_height()//2))
+    pygame.display.update((0,0, width, SQUARESIZE))
+
 def main_game(difficulty):
     board = create_board()
+    searcher = create_searcher()  # Transposition tables carry over between the AI's moves in this game
+    # The search runs on a worker thread so this loop keeps pumping events while the AI thinks
+    executor = ThreadPoolExecutor(max_workers=1)
+    ai_future = None
+    ponder_stop = None  # Set when the player moves; the pondering search then returns within a few ms
+    ai_turn_start = 0
+    clock = pygame.time.Clock()
     game_over = False
     turn = 0  # 0 = Player, 1 = AI
 
     draw_board(board)
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+    try:
+        while True:
+            clock.tick(FPS)
+            # Checked before anyone moves, so neither a ponder nor the AI's search starts on a full board
+            if not game_over and board.is_full():
+                draw_board(board)
+                pygame.time.wait(500)
+                return 0  # Draw
 
-            if not game_over and turn == 0:
-                if event.type == pygame.MOUSEMOTION:
-                    pygame.draw.rect(screen, BLACK, (0,0, width, SQUARESIZE))
-                    posx = event.pos[0]
-                    pygame.draw.circle(screen, RED, (posx, int(SQUARESIZE/2)), RADIUS)
-                    pygame.display.update()
+            if not game_over and turn == 0 and ponder_stop is None and should_ponder(board, difficulty, searcher):
+                ponder_stop = threading.Event()
+                executor.submit(searcher.ponder, board.copy(), HARD_TIME_BUDGET, ponder_stop)
 
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    pygame.draw.rect(screen, BLACK, (0,0, width, SQUARESIZE))
-                    posx = event.pos[0]
-                    col = int(math.floor(posx/SQUARESIZE))
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    searcher.cancel()
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    searcher.close()
+                    pygame.quit()
+                    sys.exit()
+
+                if not game_over and turn == 0:
+                    if event.type == pygame.MOUSEMOTION:
+                        pygame.draw.rect(screen, BLACK, (0,0, width, SQUARESIZE))
+                        posx = event.pos[0]
+                        pygame.draw.circle(screen, RED, (posx, int(SQUARESIZE/2)), RADIUS)
+                        pygame.display.update()
+
+                    if event.type == pygame.MOUSEBUTTONDOWN:
+                        pygame.draw.rect(screen, BLACK, (0,0, width, SQUARESIZE))
+                        posx = event.pos[0]
+                        col = int(math.floor(posx/SQUARESIZE))
+
+                        if is_valid_location(board, col):
+                            if ponder_stop is not None:
+                                ponder_stop.set()
+                                ponder_stop = None
+                            drop_piece(board, col)
 
-                    if is_valid_location(board, col):
-                        row = get_next_open_row(board, col)
-                        drop_piece(board, row, col, 1)
+                            if winning_move_at(board, col):
+                                draw_board(board)
+                                pygame.time.wait(500)
+                                return 1  # Player wins
 
-                        if winning_move(board, 1):
                             draw_board(board)
-                            pygame.time.wait(500)
-                            return 1  # Player wins
+                            turn = 1  # AI's turn
 
-                        draw_board(board)
-                        turn = 1  # AI's turn
-
-        # AI turn
-        if not game_over and turn == 1:
-            pygame.time.wait(500)  # Pause before AI moves
-            if difficulty == 'Easy':
-                col = ai_move_easy(board)
-            elif difficulty == 'Medium':
-                col = ai_move_medium(board)
-            else:
-                col = ai_move_hard(board)
-
-            if is_valid_location(board, col):
-                row = get_next_open_row(board, col)
-                drop_piece(board, row, col, 2)
-
-                if winning_move(board, 2):
-                    draw_board(board)
-                    pygame.time.wait(500)
-                    return 2  # AI wins
+            # AI turn
+            if not game_over and turn == 1:
+                if ai_future is None:
+                    # The worker searches a copy so drawing never sees a half-made move
+                    ai_future = executor.submit(choose_ai_move, board.copy(), difficulty, searcher)
+                    ai_turn_start = pygame.time.get_ticks()
 
-                draw_board(board)
-                turn = 0  # Player's turn
+                # Pause before AI moves, even when the answer is instant
+                if not ai_future.done() or pygame.time.get_ticks() - ai_turn_start < AI_MOVE_DELAY:
+                    draw_thinking_indicator()
+                    continue
+
+                col = ai_future.result()
+                ai_future = None
+                pygame.draw.rect(screen, BLACK, (0,0, width, SQUARESIZE))
 
-        # Check draw condition (all cols full)
-        if not game_over and len([c for c in range(COLUMN_COUNT) if is_valid_location(board, c)]) == 0:
-            draw_board(board)
-            pygame.time.wait(500)
-            return 0  # Draw
+                if is_valid_location(board, col):
+                    drop_piece(board, col)
+
+                    if winning_move_at(board, col):
+                        draw_board(board)
+                        pygame.time.wait(500)
+                        return 2  # AI wins
+
+                    draw_board(board)
+                    turn = 0  # Player's turn
+    finally:
+        searcher.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+        searcher.close()
 
 def main():
+    global PONDER
+    parser = argparse.ArgumentParser(description="Connect Four - Single Player")
+    parser.add_argument("--stats", metavar="PATH", default=os.environ.get("CONNECT_FOUR_STATS"),
+                        help="append per-move AI search statistics to PATH as JSON lines")
+    parser.add_argument("--rows", type=int, default=ROW_COUNT)
+    parser.add_argument("--columns", type=int, default=COLUMN_COUNT)
+    parser.add_argument("--connect", type=int, default=CONNECT, help="discs in a row needed to win")
+    parser.add_argument("--no-ponder", dest="ponder", action="store_false",
+                        help="do not let the hard AI think during the player's turn")
+    args = parser.parse_args()
+    if min(args.rows, args.columns) < 1 or not 2 <= args.connect <= max(args.rows, args.columns):
+        parser.error("--connect must be at least 2 and fit on the board")
+    configure_board(args.rows, args.columns, args.connect)
+    PONDER = args.ponder
+    if args.stats:
+        open_stats_log(args.stats)
+
+    init_display()
     running = True
     in_menu = True
     difficulty = None
@@ -328,6 +430,9 @@ def main():
                             difficulty = 'Hard'
                             in_menu = False
                         elif height//3 + 180 < y < height//3 + 230:
+                            difficulty = 'Perfect'
+                            in_menu = False
+                        elif height//3 + 240 < y < height//3 + 290:
                             running = False
 
         else:
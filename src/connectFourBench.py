@@ -0,0 +1,140 @@
+import argparse
+import random
+import time
+
+from connectFourEngine import ROW_COUNT, COLUMN_COUNT, Position, Searcher, ParallelSearcher
+from connectFourSolver import Solver
+
+# Fixed opening/middlegame positions (column sequences) so runs are comparable
+BENCH_POSITIONS = [
+    [3],
+    [3, 3, 2],
+    [3, 2, 4, 4, 2],
+    [3, 3, 3, 4, 2, 2, 4],
+    [3, 4, 2, 3, 3, 2, 4, 1, 5],
+]
+
+
+def make_position(moves):
+    position = Position()
+    for col in moves:
+        position.make_move(col)
+    return position
+
+
+def create_searcher(workers):
+    return ParallelSearcher(workers) if workers > 1 else Searcher()
+
+
+def bench_parallel(args):
+    print(f"{'workers':>7} {'depth':>5} {'time (s)':>9} {'nodes/s':>10} {'speedup':>8} {'depth in budget':>16}")
+    baseline = None
+    for workers in args.workers:
+        searcher = create_searcher(workers)
+        try:
+            # Warm up the pool so process start-up is not counted
+            searcher.search(make_position([3]), 1.0, max_depth=2)
+
+            elapsed = 0
+            nodes = 0
+            for moves in BENCH_POSITIONS:
+                start = time.perf_counter()
+                searcher.search(make_position(moves), 3600, max_depth=args.depth)
+                elapsed += time.perf_counter() - start
+                nodes += searcher.nodes
+
+            depths = []
+            for moves in BENCH_POSITIONS:
+                searcher.search(make_position(moves), args.budget)
+                depths.append(searcher.depth_reached)
+        finally:
+            searcher.close()
+
+        if baseline is None:
+            baseline = elapsed
+        average_depth = sum(depths) / len(depths)
+        print(f"{workers:>7} {args.depth:>5} {elapsed:>9.2f} {nodes / elapsed:>10.0f} {baseline / elapsed:>7.2f}x {average_depth:>16.1f}")
+
+
+def bench_ordering(args):
+    # Effective branching factor: how much the tree grows per extra ply of iterative deepening
+    print(f"{'ordering':>8} {'nodes':>10} {'time (s)':>9} {'EBF':>6}")
+    for move_ordering in (False, True):
+        total_nodes = 0
+        elapsed = 0
+        growth = []
+        for moves in BENCH_POSITIONS:
+            searcher = Searcher(move_ordering=move_ordering)
+            start = time.perf_counter()
+            searcher.search(make_position(moves), 3600, max_depth=args.depth)
+            elapsed += time.perf_counter() - start
+            counts = searcher.nodes_by_depth
+            total_nodes += counts[-1]
+            growth.append((counts[-1] / counts[0]) ** (1 / (len(counts) - 1)))
+        label = "on" if move_ordering else "off"
+        print(f"{label:>8} {total_nodes:>10} {elapsed:>9.2f} {sum(growth) / len(growth):>6.2f}")
+
+
+def random_position(rng, empty):
+    # Plays random moves, taking wins and avoiding drops that hand the opponent one, until `empty` cells remain
+    while True:
+        position = Position()
+        while ROW_COUNT * COLUMN_COUNT - len(position.moves) > empty:
+            piece = position.piece_to_move
+            valid = position.get_valid_locations()
+            if any(position.is_winning_drop(col, piece) for col in valid):
+                break
+            safe = []
+            for col in valid:
+                position.make_move(col)
+                if not any(position.is_winning_drop(c, 3 - piece) for c in position.get_valid_locations()):
+                    safe.append(col)
+                position.unmake_move()
+            position.make_move(rng.choice(safe or valid))
+        else:
+            return position
+
+
+def bench_solver(args):
+    rng = random.Random(args.seed)
+    print(f"{'empty':>5} {'mean (s)':>9} {'max (s)':>9} {'nodes/s':>10}")
+    for empty in args.empty:
+        times = []
+        nodes = 0
+        for _ in range(args.positions):
+            position = random_position(rng, empty)
+            solver = Solver()
+            start = time.perf_counter()
+            solver.best_move(position)
+            times.append(time.perf_counter() - start)
+            nodes += solver.nodes
+        total = sum(times)
+        print(f"{empty:>5} {total / len(times):>9.3f} {max(times):>9.3f} {nodes / total if total else 0:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect Four engine benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parallel = subparsers.add_parser("parallel", help="root-parallel search scaling")
+    parallel.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parallel.add_argument("--depth", type=int, default=7, help="fixed depth timed for the speedup column")
+    parallel.add_argument("--budget", type=float, default=1.0, help="per-move seconds for the depth column")
+    parallel.set_defaults(func=bench_parallel)
+
+    ordering = subparsers.add_parser("ordering", help="effective branching factor with and without move ordering")
+    ordering.add_argument("--depth", type=int, default=8)
+    ordering.set_defaults(func=bench_ordering)
+
+    solver = subparsers.add_parser("solver", help="exact solver time against empty cells")
+    solver.add_argument("--empty", type=int, nargs="+", default=[8, 12, 16, 20, 24])
+    solver.add_argument("--positions", type=int, default=10, help="positions solved per empty count")
+    solver.add_argument("--seed", type=int, default=1)
+    solver.set_defaults(func=bench_solver)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
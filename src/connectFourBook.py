@@ -0,0 +1,157 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+
+from connectFourEngine import COLUMN_COUNT, H1, Position, Searcher
+
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "connectFour.book")
+
+# Header: magic, format version, plies covered, entry count
+HEADER = struct.Struct("<4sHHI")
+MAGIC = b"C4BK"
+VERSION = 1
+
+# Each entry is one little-endian uint64: unique position key << 8 | best column
+ENTRY = struct.Struct("<Q")
+
+COLUMN_BITS = (1 << H1) - 1
+
+
+def mirror_key(key):
+    mirrored = 0
+    for c in range(COLUMN_COUNT):
+        mirrored |= ((key >> (c * H1)) & COLUMN_BITS) << ((COLUMN_COUNT - 1 - c) * H1)
+    return mirrored
+
+
+def canonical_key(position):
+    # Mirror images share one entry; the flag says whether the stored move must be mirrored back
+    key = position.unique_key()
+    mirrored = mirror_key(key)
+    if mirrored < key:
+        return mirrored, True
+    return key, False
+
+
+class OpeningBook:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.plies, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.data.close()
+            raise ValueError(f"{path} is not a version {VERSION} Connect Four book")
+
+    @classmethod
+    def open(cls, path=BOOK_PATH):
+        # A missing book just means every move is searched
+        if not os.path.exists(path):
+            return None
+        return cls(path)
+
+    def close(self):
+        self.data.close()
+
+    def lookup(self, position):
+        if len(position.moves) >= self.plies:
+            return None
+
+        key, mirrored = canonical_key(position)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = ENTRY.unpack_from(self.data, HEADER.size + mid * ENTRY.size)[0]
+            entry_key = entry >> 8
+            if entry_key < key:
+                lo = mid + 1
+            elif entry_key > key:
+                hi = mid
+            else:
+                col = entry & 0xFF
+                return COLUMN_COUNT - 1 - col if mirrored else col
+        return None
+
+
+def book_positions(plies):
+    # Every distinct position (up to mirroring) with fewer than `plies` discs and no winner yet
+    positions = {}
+    position = Position()
+
+    def visit():
+        key = canonical_key(position)[0]
+        if key in positions:
+            return
+        positions[key] = position.moves[:]
+        if len(position.moves) + 1 >= plies:
+            return
+        for col in position.get_valid_locations():
+            position.make_move(col)
+            if not position.winning_move_at(col):
+                visit()
+            position.unmake_move()
+
+    visit()
+    return positions
+
+
+def build_book(path, plies, depth):
+    start = time.perf_counter()
+    positions = book_positions(plies)
+    searcher = Searcher()
+
+    entries = []
+    for key, moves in positions.items():
+        position = Position()
+        for col in moves:
+            position.make_move(col)
+        # Fixed depth rather than a time budget so the same settings always build the same file
+        col, value = searcher.search(position, float("inf"), max_depth=depth)
+        if canonical_key(position)[1]:
+            col = COLUMN_COUNT - 1 - col
+        entries.append(key << 8 | col)
+    entries.sort()
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, plies, len(entries)))
+        for entry in entries:
+            f.write(ENTRY.pack(entry))
+    return len(entries), time.perf_counter() - start
+
+
+def measure_lookup(path, plies, repeat=20):
+    book = OpeningBook(path)
+    positions = []
+    for moves in book_positions(plies).values():
+        position = Position()
+        for col in moves:
+            position.make_move(col)
+        positions.append(position)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for position in positions:
+            book.lookup(position)
+    elapsed = time.perf_counter() - start
+    book.close()
+    return elapsed / (repeat * len(positions))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Connect Four opening book")
+    parser.add_argument("--plies", type=int, default=5, help="book covers positions with fewer discs than this")
+    parser.add_argument("--depth", type=int, default=10, help="search depth used for each book move")
+    parser.add_argument("--output", default=BOOK_PATH)
+    args = parser.parse_args()
+
+    count, build_time = build_book(args.output, args.plies, args.depth)
+    latency = measure_lookup(args.output, args.plies)
+    print(f"positions: {count}")
+    print(f"build time: {build_time:.1f} s")
+    print(f"file size: {os.path.getsize(args.output)} bytes")
+    print(f"lookup latency: {latency * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
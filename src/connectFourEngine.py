@@ -0,0 +1,734 @@
+import functools
+import math
+import multiprocessing
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Standard board size and line length; the opening book and exact solver only handle this shape
+ROW_COUNT = 6
+COLUMN_COUNT = 7
+CONNECT = 4
+
+# Each column takes ROW_COUNT + 1 bits so shifted lines never wrap into the next column
+H1 = ROW_COUNT + 1
+
+BOTTOM_MASK = sum(1 << (c * H1) for c in range(COLUMN_COUNT))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROW_COUNT) - 1)
+
+# Columns from the centre outwards, the usual strength order in Connect Four
+CENTER_ORDER = sorted(range(COLUMN_COUNT), key=lambda c: abs(COLUMN_COUNT // 2 - c))
+
+
+def cell_bit(row, col, h1=H1):
+    return 1 << (col * h1 + row)
+
+
+def build_windows(rows, columns, connect):
+    # Every line of `connect` cells, as lists of bit indices
+    h1 = rows + 1
+    windows = []
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (-1, 1)):
+        for r in range(rows):
+            for c in range(columns):
+                end_r = r + dr * (connect - 1)
+                if not 0 <= end_r < rows or c + dc * (connect - 1) >= columns:
+                    continue
+                windows.append([(c + dc * i) * h1 + r + dr * i for i in range(connect)])
+    return windows
+
+
+def evaluate_window(own, opp, connect=CONNECT):
+    score = 0
+    empty = connect - own - opp
+
+    if own == connect:
+        score += 100
+    elif own == connect - 1 and empty == 1:
+        score += 5
+    elif own == connect - 2 and empty == 2:
+        score += 2
+
+    if opp == connect - 1 and empty == 1:
+        score -= 4
+
+    return score
+
+
+class Geometry:
+    # Board shape and line length with every lookup table derived from them; get_geometry shares one per shape
+    def __init__(self, rows, columns, connect):
+        self.rows = rows
+        self.columns = columns
+        self.connect = connect
+        # Each column takes rows + 1 bits so shifted lines never wrap into the next column
+        self.h1 = h1 = rows + 1
+        self.cells = rows * columns
+        bits = columns * h1
+        self.bottom_mask = sum(1 << (c * h1) for c in range(columns))
+        self.board_mask = self.bottom_mask * ((1 << rows) - 1)
+        self.center_mask = ((1 << rows) - 1) << (columns // 2 * h1)
+        self.directions = (1, h1, h1 + 1, h1 - 1)
+        self.center_order = sorted(range(columns), key=lambda c: abs(columns // 2 - c))
+
+        # Line-membership index: cell_window_ids[bit index] lists the windows through that cell, the only
+        # ones a drop there can complete or rescore, so win checks and evaluation never scan the whole board
+        self.windows = []
+        self.cell_window_ids = [[] for _ in range(bits)]
+        for w, cells in enumerate(build_windows(rows, columns, connect)):
+            self.windows.append(sum(1 << i for i in cells))
+            for i in cells:
+                self.cell_window_ids[i].append(w)
+        self.cell_windows = [[self.windows[w] for w in ids] for ids in self.cell_window_ids]
+
+        # Union of those windows; fewer than `connect` discs of one piece there rules out a win without checking each window
+        self.cell_neighbourhoods = []
+        for windows in self.cell_windows:
+            neighbourhood = 0
+            for window in windows:
+                neighbourhood |= window
+            self.cell_neighbourhoods.append(neighbourhood)
+
+        # One random 64-bit key per (piece, bit index); seeded so keys are stable across runs
+        zobrist_rng = random.Random(0xC4)
+        self.zobrist = [[zobrist_rng.getrandbits(64) for _ in range(bits)] for _ in range(2)]
+
+        # Positions keep one code per window, piece-1 count * (connect + 1) + piece-2 count, updated on make/unmake
+        base = connect + 1
+        codes = base * base
+        window_scores = [[evaluate_window(own, opp, connect) if own + opp <= connect else 0 for opp in range(base)] for own in range(base)]
+        self.window_code_step = (base, 1)
+        window_code_scores = [
+            [window_scores[code // base][code % base] for code in range(codes)],
+            [window_scores[code % base][code // base] for code in range(codes)],
+        ]
+
+        # score_deltas[player][piece - 1][code]: change in piece's score when player adds a disc to that window
+        self.score_deltas = [
+            [[window_code_scores[piece][code + step] - window_code_scores[piece][code] if code + step < codes else 0 for code in range(codes)] for piece in range(2)]
+            for step in self.window_code_step
+        ]
+
+        # Code of a window holding connect - 1 of player's discs and nothing else; one more disc completes it
+        self.win_code = ((connect - 1) * base, connect - 1)
+
+        self.center_bonus = [3 if self.center_mask >> i & 1 else 0 for i in range(bits)]
+
+    def cell_bit(self, row, col):
+        return cell_bit(row, col, self.h1)
+
+
+def get_geometry(rows=ROW_COUNT, columns=COLUMN_COUNT, connect=CONNECT):
+    # Always one cache key per shape however it was asked for, so `is STANDARD` holds for 6x7 boards
+    return _cached_geometry(rows, columns, connect)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_geometry(rows, columns, connect):
+    return Geometry(rows, columns, connect)
+
+
+STANDARD = get_geometry()
+
+# Transposition table entry flags
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+WIN_SCORE = 100000000000000
+LOSS_SCORE = -10000000000000
+
+
+def connected(bitboard, directions, connect):
+    for shift in directions:
+        m = bitboard
+        for i in range(1, connect):
+            m &= bitboard >> (i * shift)
+        if m:
+            return True
+    return False
+
+
+class Position:
+    def __init__(self, geometry=STANDARD):
+        self.geometry = geometry
+        # bitboards[0] holds piece 1 (moves first), bitboards[1] holds piece 2
+        self.bitboards = [0, 0]
+        self.heights = [c * geometry.h1 for c in range(geometry.columns)]
+        self.moves = []
+        self.key = 0
+        # score_position for piece 1 and piece 2, kept current by make/unmake
+        self.scores = (0, 0)
+        self.score_history = []
+        self.window_codes = [0] * len(geometry.windows)
+
+    @property
+    def mask(self):
+        return self.bitboards[0] | self.bitboards[1]
+
+    @property
+    def piece_to_move(self):
+        return len(self.moves) % 2 + 1
+
+    def unique_key(self):
+        # Piece 1's discs plus a marker bit above each column's top disc; identifies the position exactly
+        return self.bitboards[0] + self.mask + self.geometry.bottom_mask
+
+    def copy(self):
+        position = Position(self.geometry)
+        position.bitboards = self.bitboards[:]
+        position.heights = self.heights[:]
+        position.moves = self.moves[:]
+        position.key = self.key
+        position.scores = self.scores
+        position.score_history = self.score_history[:]
+        position.window_codes = self.window_codes[:]
+        return position
+
+    def is_valid_location(self, col):
+        return self.heights[col] < col * self.geometry.h1 + self.geometry.rows
+
+    def get_next_open_row(self, col):
+        return self.heights[col] - col * self.geometry.h1
+
+    def get_valid_locations(self):
+        return [c for c in range(self.geometry.columns) if self.is_valid_location(c)]
+
+    def is_full(self):
+        return len(self.moves) == self.geometry.cells
+
+    def make_move(self, col):
+        geometry = self.geometry
+        player = len(self.moves) & 1
+        index = self.heights[col]
+        self.bitboards[player] ^= 1 << index
+        self.key ^= geometry.zobrist[player][index]
+        self.heights[col] += 1
+        self.moves.append(col)
+
+        self.score_history.append(self.scores)
+        score1, score2 = self.scores
+        deltas1, deltas2 = geometry.score_deltas[player]
+        step = geometry.window_code_step[player]
+        codes = self.window_codes
+        for w in geometry.cell_window_ids[index]:
+            code = codes[w]
+            score1 += deltas1[code]
+            score2 += deltas2[code]
+            codes[w] = code + step
+        if player:
+            score2 += geometry.center_bonus[index]
+        else:
+            score1 += geometry.center_bonus[index]
+        self.scores = (score1, score2)
+
+    def unmake_move(self):
+        geometry = self.geometry
+        col = self.moves.pop()
+        player = len(self.moves) & 1
+        self.heights[col] -= 1
+        index = self.heights[col]
+        self.bitboards[player] ^= 1 << index
+        self.key ^= geometry.zobrist[player][index]
+
+        step = geometry.window_code_step[player]
+        codes = self.window_codes
+        for w in geometry.cell_window_ids[index]:
+            codes[w] -= step
+        self.scores = self.score_history.pop()
+
+    def winning_move(self, piece):
+        return connected(self.bitboards[piece - 1], self.geometry.directions, self.geometry.connect)
+
+    def winning_move_at(self, col):
+        # Checks only the windows through the top disc of col, for whichever piece owns it
+        geometry = self.geometry
+        index = self.heights[col] - 1
+        bitboard = self.bitboards[0] if self.bitboards[0] >> index & 1 else self.bitboards[1]
+        if (bitboard & geometry.cell_neighbourhoods[index]).bit_count() < geometry.connect:
+            return False
+        for window in geometry.cell_windows[index]:
+            if bitboard & window == window:
+                return True
+        return False
+
+    def is_winning_drop(self, col, piece):
+        geometry = self.geometry
+        index = self.heights[col]
+        bitboard = self.bitboards[piece - 1] | (1 << index)
+        if (bitboard & geometry.cell_neighbourhoods[index]).bit_count() < geometry.connect:
+            return False
+        for window in geometry.cell_windows[index]:
+            if bitboard & window == window:
+                return True
+        return False
+
+    def to_grid(self):
+        geometry = self.geometry
+        grid = [[0] * geometry.columns for _ in range(geometry.rows)]
+        for piece in (1, 2):
+            bitboard = self.bitboards[piece - 1]
+            for c in range(geometry.columns):
+                for r in range(geometry.rows):
+                    if bitboard & geometry.cell_bit(r, c):
+                        grid[r][c] = piece
+        return grid
+
+
+def score_position(position, piece):
+    return position.scores[piece - 1]
+
+
+def score_children(position, piece):
+    # Scores every child position for piece in one pass, without making the moves, and flags drops that win
+    geometry = position.geometry
+    player = len(position.moves) & 1
+    deltas = geometry.score_deltas[player][piece - 1]
+    win_code = geometry.win_code[player]
+    own_move = player == piece - 1
+    base = position.scores[piece - 1]
+    codes = position.window_codes
+    center_bonus = geometry.center_bonus
+    cell_window_ids = geometry.cell_window_ids
+
+    children = []
+    for col in position.get_valid_locations():
+        index = position.heights[col]
+        score = base + center_bonus[index] if own_move else base
+        wins = False
+        for w in cell_window_ids[index]:
+            code = codes[w]
+            score += deltas[code]
+            if code == win_code:
+                wins = True
+        children.append((col, score, wins))
+    return children
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class TranspositionTable:
+    def __init__(self, size=1 << 18):
+        # Slot count is a power of two so the index is a mask of the Zobrist key
+        self.size = 1 << (size - 1).bit_length()
+        self.entries = [None] * self.size
+        self.age = 0
+
+    def new_search(self):
+        self.age += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.age = 0
+
+    def probe(self, key):
+        entry = self.entries[key & (self.size - 1)]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, flag, value, move):
+        index = key & (self.size - 1)
+        entry = self.entries[index]
+        # Depth-preferred replacement, but entries left over from earlier moves always give way
+        if entry is None or entry[0] == key or entry[5] != self.age or depth >= entry[1]:
+            self.entries[index] = (key, depth, flag, value, move, self.age)
+
+
+class Searcher:
+    def __init__(self, tt_size=1 << 18, move_ordering=True):
+        self.tt = TranspositionTable(tt_size)
+        # Off: left-to-right order with only the TT move first and no PVS, kept for comparison
+        self.move_ordering = move_ordering
+        self.geometry = None
+        self.deadline = None
+        # unique_key -> (column, value, depth, seconds) for replies searched by ponder()
+        self.pondered = {}
+        self.ponder_stop = None
+        self.reset_stats()
+        self.stop_event = threading.Event()
+
+    def cancel(self):
+        # Safe to call from another thread; the running search unwinds at its next time check
+        self.stop_event.set()
+
+    def close(self):
+        self.cancel()
+
+    def use_geometry(self, geometry):
+        # Killer and history tables are sized to the board, so a new board shape starts them afresh
+        if geometry is not self.geometry:
+            self.geometry = geometry
+            self.killers = [[None, None] for _ in range(geometry.cells + 1)]
+            self.history = [[0] * (geometry.columns * geometry.h1) for _ in range(2)]
+
+    def reset_stats(self, root_ply=0):
+        self.root_ply = root_ply
+        self.nodes = 0
+        self.leaves = 0
+        self.tt_hits = 0
+        self.cutoffs_by_ply = []
+        self.nodes_by_depth = []
+        self.depth_reached = 0
+        self.ponder_depth = 0
+
+    def stats(self):
+        return {
+            "nodes": self.nodes,
+            "leaf_evaluations": self.leaves,
+            "cutoffs_by_ply": self.cutoffs_by_ply,
+            "tt_hits": self.tt_hits,
+            "depth_reached": self.depth_reached,
+            "ponder_depth": self.ponder_depth,
+        }
+
+    def search(self, position, time_budget=1.0, max_depth=None):
+        # Iterative deepening: keep the result of the deepest fully completed iteration
+        self.tt.new_search()
+        self.use_geometry(position.geometry)
+        self.reset_stats(len(position.moves))
+        # Old history should guide, not dominate, the next move's ordering
+        for history in self.history:
+            for i in range(len(history)):
+                history[i] //= 2
+
+        # Time already spent pondering this exact position counts against the budget
+        pondered = self.pondered.get(position.unique_key())
+        self.pondered = {}
+        if pondered is not None:
+            time_budget -= pondered[3]
+            self.ponder_depth = pondered[2]
+        self.deadline = time.perf_counter() + time_budget
+        return self.deepen(position, max_depth, pondered)
+
+    def ponder(self, position, time_budget=1.0, stop_event=None):
+        # Runs during the opponent's turn: deepens each reply, the expected one first, for up to
+        # time_budget seconds. search() resumes from these results instead of starting again at depth 1.
+        self.ponder_stop = stop_event
+        self.pondered = {}
+        try:
+            self.tt.new_search()
+            self.use_geometry(position.geometry)
+            entry = self.tt.probe(position.key)
+            replies = self.order_moves(position, position.get_valid_locations(), entry[4] if entry else None)
+            for col in replies:
+                if self.stopped():
+                    break
+                position.make_move(col)
+                try:
+                    if not position.winning_move_at(col) and not position.is_full():
+                        self.reset_stats(len(position.moves))
+                        start = time.perf_counter()
+                        self.deadline = start + time_budget
+                        column, value = self.deepen(position)
+                        if self.depth_reached:
+                            self.pondered[position.unique_key()] = (column, value, self.depth_reached, time.perf_counter() - start)
+                finally:
+                    position.unmake_move()
+        finally:
+            self.ponder_stop = None
+
+    def stopped(self):
+        return self.stop_event.is_set() or (self.ponder_stop is not None and self.ponder_stop.is_set())
+
+    def deepen(self, position, max_depth=None, pondered=None):
+        empty = position.geometry.cells - len(position.moves)
+        if max_depth is None or max_depth > empty:
+            max_depth = empty
+
+        if pondered is not None:
+            column, value, self.depth_reached = pondered[:3]
+            if abs(value) >= -LOSS_SCORE:
+                return column, value
+        else:
+            column, value = random.choice(position.get_valid_locations()), 0
+        for depth in range(self.depth_reached + 1, max_depth + 1):
+            if self.stopped() or (self.depth_reached and time.perf_counter() > self.deadline):
+                break
+            try:
+                column, value = self.minimax(position, depth, -math.inf, math.inf, position.piece_to_move == 2)
+            except SearchTimeout:
+                break
+            self.depth_reached = depth
+            self.nodes_by_depth.append(self.nodes + self.leaves)
+            if abs(value) >= -LOSS_SCORE:
+                break  # Forced result found, deeper search cannot change it
+        return column, value
+
+    def minimax(self, position, depth, alpha, beta, maximizingPlayer):
+        self.nodes += 1
+        # Checked often enough that a node costing more on a wide board still stops close to the deadline
+        if not self.nodes & 255 and (self.stopped() or time.perf_counter() > self.deadline):
+            raise SearchTimeout
+
+        if position.moves and position.winning_move_at(position.moves[-1]):
+            # Only the side that just moved can have completed a line; remaining depth favours quicker wins
+            return (None, WIN_SCORE + depth) if len(position.moves) % 2 == 0 else (None, LOSS_SCORE - depth)
+
+        valid_locations = position.get_valid_locations()
+        if not valid_locations:
+            return (None, 0)
+        if depth == 0:
+            return (None, score_position(position, 2))
+        if depth == 1:
+            return self.evaluate_frontier(position, maximizingPlayer)
+
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        entry = self.tt.probe(position.key)
+        if entry is not None:
+            self.tt_hits += 1
+            tt_move = entry[4]
+            if entry[1] >= depth and tt_move is not None:
+                flag, tt_value = entry[2], entry[3]
+                if flag == EXACT:
+                    return tt_move, tt_value
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, tt_value)
+                else:
+                    beta = min(beta, tt_value)
+                if alpha >= beta:
+                    return tt_move, tt_value
+            if tt_move is not None and not self.move_ordering:
+                # Search the previously best move first for earlier cutoffs
+                valid_locations.remove(tt_move)
+                valid_locations.insert(0, tt_move)
+
+        if self.move_ordering:
+            valid_locations = self.order_moves(position, valid_locations, tt_move)
+        ply = len(position.moves)
+
+        if maximizingPlayer:
+            value = -math.inf
+            column = valid_locations[0]
+            for i, col in enumerate(valid_locations):
+                index = position.heights[col]
+                position.make_move(col)
+                try:
+                    if i == 0 or not self.move_ordering:
+                        new_score = self.minimax(position, depth-1, alpha, beta, False)[1]
+                    else:
+                        # PVS: prove the move is no better than alpha with a null window, re-search only if it is
+                        new_score = self.minimax(position, depth-1, alpha, alpha + 1, False)[1]
+                        if alpha < new_score < beta:
+                            new_score = self.minimax(position, depth-1, alpha, beta, False)[1]
+                finally:
+                    position.unmake_move()
+                if new_score > value:
+                    value = new_score
+                    column = col
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    self.record_cutoff(ply, col, index, depth)
+                    break
+        else:
+            value = math.inf
+            column = valid_locations[0]
+            for i, col in enumerate(valid_locations):
+                index = position.heights[col]
+                position.make_move(col)
+                try:
+                    if i == 0 or not self.move_ordering:
+                        new_score = self.minimax(position, depth-1, alpha, beta, True)[1]
+                    else:
+                        new_score = self.minimax(position, depth-1, beta - 1, beta, True)[1]
+                        if alpha < new_score < beta:
+                            new_score = self.minimax(position, depth-1, alpha, beta, True)[1]
+                finally:
+                    position.unmake_move()
+                if new_score < value:
+                    value = new_score
+                    column = col
+                beta = min(beta, value)
+                if alpha >= beta:
+                    self.record_cutoff(ply, col, index, depth)
+                    break
+
+        if value <= alpha_orig:
+            flag = UPPER_BOUND
+        elif value >= beta_orig:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.tt.store(position.key, depth, flag, value, column)
+        return column, value
+
+    def order_moves(self, position, valid_locations, tt_move):
+        # Transposition table move, then killers, then by history score; centre-out breaks ties
+        killers = self.killers[len(position.moves)]
+        history = self.history[len(position.moves) & 1]
+        heights = position.heights
+
+        def priority(col):
+            if col == tt_move:
+                return (2, 0)
+            if col in killers:
+                return (1, 0)
+            return (0, history[heights[col]])
+
+        centre_out = [col for col in position.geometry.center_order if col in valid_locations]
+        return sorted(centre_out, key=priority, reverse=True)
+
+    def record_cutoff(self, ply, col, index, depth):
+        distance = ply - self.root_ply
+        while len(self.cutoffs_by_ply) <= distance:
+            self.cutoffs_by_ply.append(0)
+        self.cutoffs_by_ply[distance] += 1
+
+        if self.move_ordering:
+            killers = self.killers[ply]
+            if killers[0] != col:
+                killers[1] = killers[0]
+                killers[0] = col
+            self.history[ply & 1][index] += depth * depth
+
+    def evaluate_frontier(self, position, maximizingPlayer):
+        # Every child is a leaf, so score them all in one batch instead of recursing
+        child_fills_board = len(position.moves) + 1 == position.geometry.cells
+        column, value = None, None
+        children = score_children(position, 2)
+        self.leaves += len(children)
+        for col, score, wins in children:
+            if wins:
+                score = WIN_SCORE if maximizingPlayer else LOSS_SCORE
+            elif child_fills_board:
+                score = 0
+            if value is None or (score > value if maximizingPlayer else score < value):
+                column, value = col, score
+        return column, value
+
+
+# Per-process state for ParallelSearcher workers, set up once by _init_worker
+_worker_searcher = None
+_shared_alpha = None
+
+
+def _init_worker(shared_alpha, stop_event, tt_size):
+    global _worker_searcher, _shared_alpha
+    _worker_searcher = Searcher(tt_size)
+    _worker_searcher.stop_event = stop_event
+    _shared_alpha = shared_alpha
+
+
+def _search_root_move(shape, moves, col, depth, deadline, age):
+    # Geometries are rebuilt from (rows, columns, connect) in each worker instead of being pickled per task
+    position = Position(get_geometry(*shape))
+    for move in moves:
+        position.make_move(move)
+
+    searcher = _worker_searcher
+    searcher.use_geometry(position.geometry)
+    searcher.deadline = deadline
+    searcher.tt.age = age
+    searcher.reset_stats(len(moves))
+
+    # Start from the best root score any worker has proven so far. The shared value is from the
+    # root mover's point of view, so it is negated when piece 1 (the minimizing side) is to move.
+    sign = 1 if position.piece_to_move == 2 else -1
+    best = _shared_alpha.value
+    position.make_move(col)
+    try:
+        if sign == 1:
+            value = searcher.minimax(position, depth-1, best, math.inf, False)[1]
+        else:
+            value = searcher.minimax(position, depth-1, -math.inf, -best, True)[1]
+    except SearchTimeout:
+        return col, None, searcher.stats()
+
+    if sign * value > best:
+        with _shared_alpha.get_lock():
+            if sign * value > _shared_alpha.value:
+                _shared_alpha.value = sign * value
+    return col, value, searcher.stats()
+
+
+class ParallelSearcher:
+    def __init__(self, workers, tt_size=1 << 18):
+        # Each worker keeps its own transposition table for the whole game
+        self.workers = workers
+        self.shared_alpha = multiprocessing.Value('d', -math.inf)
+        self.stop_event = multiprocessing.Event()
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.shared_alpha, self.stop_event, tt_size)
+        )
+        self.age = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.nodes = 0
+        self.leaves = 0
+        self.tt_hits = 0
+        self.cutoffs_by_ply = []
+        self.depth_reached = 0
+
+    def stats(self):
+        return {
+            "nodes": self.nodes,
+            "leaf_evaluations": self.leaves,
+            "cutoffs_by_ply": self.cutoffs_by_ply,
+            "tt_hits": self.tt_hits,
+            "depth_reached": self.depth_reached,
+            "workers": self.workers,
+        }
+
+    def cancel(self):
+        self.stop_event.set()
+
+    def close(self):
+        self.cancel()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def search(self, position, time_budget=1.0, max_depth=None):
+        self.age += 1
+        deadline = time.perf_counter() + time_budget
+        self.reset_stats()
+
+        geometry = position.geometry
+        shape = (geometry.rows, geometry.columns, geometry.connect)
+        empty = geometry.cells - len(position.moves)
+        if max_depth is None or max_depth > empty:
+            max_depth = empty
+
+        order = position.get_valid_locations()
+        column = random.choice(order)
+        value = 0
+        for depth in range(1, max_depth + 1):
+            if self.stop_event.is_set():
+                break
+
+            # Young brothers wait: the eldest root move sets alpha before its siblings run in parallel
+            self.shared_alpha.value = -math.inf
+            eldest = self.executor.submit(_search_root_move, shape, position.moves, order[0], depth, deadline, self.age).result()
+            siblings = [self.executor.submit(_search_root_move, shape, position.moves, col, depth, deadline, self.age) for col in order[1:]]
+            results = [eldest] + [future.result() for future in siblings]
+
+            for _, _, stats in results:
+                self.nodes += stats["nodes"]
+                self.leaves += stats["leaf_evaluations"]
+                self.tt_hits += stats["tt_hits"]
+                for distance, cutoffs in enumerate(stats["cutoffs_by_ply"]):
+                    if distance == len(self.cutoffs_by_ply):
+                        self.cutoffs_by_ply.append(0)
+                    self.cutoffs_by_ply[distance] += cutoffs
+            if any(score is None for _, score, _ in results):
+                break
+
+            # Siblings that failed low return bounds no better than the eldest's exact score
+            sign = 1 if position.piece_to_move == 2 else -1
+            best_col, best_value = results[0][0], results[0][1]
+            for col, score, _ in results[1:]:
+                if sign * score > sign * best_value:
+                    best_col, best_value = col, score
+            column, value = best_col, best_value
+            self.depth_reached = depth
+
+            order.remove(column)
+            order.insert(0, column)
+            if abs(value) >= -LOSS_SCORE:
+                break
+        return column, value
@@ -0,0 +1,149 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# Importing the game module does not open a window; only connectFour.main() does
+import connectFour
+from connectFourEngine import Searcher
+
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+
+def init_worker(hard_time_budget, shape):
+    connectFour.HARD_TIME_BUDGET = hard_time_budget
+    connectFour.configure_board(*shape)
+
+
+def play_game(task):
+    first, second, seed, opening_plies = task
+    random.seed(seed)
+    players = {1: first, 2: second}
+    searchers = {1: Searcher(), 2: Searcher()}
+    board = connectFour.create_board()
+
+    # Seeded random opening so deterministic AIs do not replay the same game every time
+    for _ in range(opening_plies):
+        valid = [col for col in board.get_valid_locations() if not board.is_winning_drop(col, board.piece_to_move)]
+        board.make_move(random.choice(valid))
+
+    moves = []
+    while True:
+        piece = board.piece_to_move
+        searcher = searchers[piece]
+        start = time.perf_counter()
+        col = connectFour.choose_ai_move(board, players[piece], searcher)
+        latency = time.perf_counter() - start
+
+        nodes = 0
+        if connectFour.last_move_source == "search":
+            nodes = searcher.nodes
+        elif connectFour.last_move_source == "solver":
+            nodes = connectFour.solver.nodes
+        moves.append((players[piece], latency, nodes))
+
+        board.make_move(col)
+        if board.winning_move_at(col):
+            return first, second, piece, moves
+        if board.is_full():
+            return first, second, 0, moves
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summarize(results):
+    matchups = {}
+    latencies = {}
+    nodes = {}
+    for first, second, winner, moves in results:
+        record = matchups.setdefault((first, second), [0, 0, 0])
+        record[winner] += 1
+        for difficulty, latency, move_nodes in moves:
+            latencies.setdefault(difficulty, []).append(latency)
+            if move_nodes:
+                searched = nodes.setdefault(difficulty, [0, 0.0])
+                searched[0] += move_nodes
+                searched[1] += latency
+
+    summary = {"matchups": [], "latency": {}}
+    for (first, second), (draws, first_wins, second_wins) in sorted(matchups.items()):
+        games = draws + first_wins + second_wins
+        summary["matchups"].append({
+            "first": first,
+            "second": second,
+            "games": games,
+            "first_win_rate": first_wins / games,
+            "second_win_rate": second_wins / games,
+            "draw_rate": draws / games,
+        })
+    for difficulty, values in sorted(latencies.items()):
+        values.sort()
+        searched_nodes, search_time = nodes.get(difficulty, (0, 0.0))
+        summary["latency"][difficulty] = {
+            "moves": len(values),
+            "p50": percentile(values, 0.50),
+            "p95": percentile(values, 0.95),
+            "p99": percentile(values, 0.99),
+            "mean": statistics.fmean(values),
+            "nodes_per_sec": searched_nodes / search_time if search_time else 0,
+        }
+    return summary
+
+
+def print_summary(summary, elapsed):
+    print(f"{'first':>8} {'second':>8} {'games':>6} {'first %':>8} {'second %':>9} {'draw %':>7}")
+    for matchup in summary["matchups"]:
+        print(f"{matchup['first']:>8} {matchup['second']:>8} {matchup['games']:>6} "
+              f"{matchup['first_win_rate'] * 100:>8.1f} {matchup['second_win_rate'] * 100:>9.1f} {matchup['draw_rate'] * 100:>7.1f}")
+    print()
+    print(f"{'AI':>8} {'moves':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'nodes/s':>10}")
+    for difficulty, latency in summary["latency"].items():
+        print(f"{difficulty:>8} {latency['moves']:>7} {latency['p50'] * 1000:>9.2f} {latency['p95'] * 1000:>9.2f} "
+              f"{latency['p99'] * 1000:>9.2f} {latency['nodes_per_sec']:>10.0f}")
+    print()
+    print(f"wall time: {elapsed:.1f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Connect Four AI self-play tournament")
+    parser.add_argument("--ais", nargs="+", default=DIFFICULTIES, choices=DIFFICULTIES + ["Perfect"])
+    parser.add_argument("--games", type=int, default=100, help="games per ordered pairing")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--opening-plies", type=int, default=2, help="random moves played before the AIs take over")
+    parser.add_argument("--hard-budget", type=float, default=0.05, help="seconds per hard AI move")
+    parser.add_argument("--rows", type=int, default=connectFour.ROW_COUNT)
+    parser.add_argument("--columns", type=int, default=connectFour.COLUMN_COUNT)
+    parser.add_argument("--connect", type=int, default=connectFour.CONNECT)
+    parser.add_argument("--json", metavar="PATH", help="also write the summary to PATH")
+    args = parser.parse_args()
+    shape = (args.rows, args.columns, args.connect)
+
+    tasks = []
+    rng = random.Random(args.seed)
+    for first, second in itertools.product(args.ais, repeat=2):
+        for _ in range(args.games):
+            tasks.append((first, second, rng.getrandbits(32), args.opening_plies))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.processes, initializer=init_worker, initargs=(args.hard_budget, shape)) as executor:
+        results = list(executor.map(play_game, tasks, chunksize=max(1, len(tasks) // (args.processes * 8))))
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    print_summary(summary, elapsed)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import time
+
+from connectFourEngine import ROW_COUNT, COLUMN_COUNT, H1, BOTTOM_MASK, BOARD_MASK, CENTER_ORDER, SearchTimeout
+
+CELLS = ROW_COUNT * COLUMN_COUNT
+MIN_SCORE = -(CELLS // 2) + 3
+TOP_MASKS = [1 << (ROW_COUNT - 1 + c * H1) for c in range(COLUMN_COUNT)]
+COLUMN_MASKS = [((1 << ROW_COUNT) - 1) << (c * H1) for c in range(COLUMN_COUNT)]
+
+
+def winning_cells(current, mask):
+    # Empty cells (reachable or not) where current would complete four
+    r = (current << 1) & (current << 2) & (current << 3)
+
+    for shift in (H1, H1 - 1, H1 + 1):
+        p = (current << shift) & (current << 2 * shift)
+        r |= p & (current << 3 * shift)
+        r |= p & (current >> shift)
+        p = (current >> shift) & (current >> 2 * shift)
+        r |= p & (current << shift)
+        r |= p & (current >> 3 * shift)
+
+    return r & (BOARD_MASK ^ mask)
+
+
+class Solver:
+    # Exact negamax solver in the style of Pascal Pons' Connect Four solver. Scores are
+    # positive for a win by the side to move: the earlier the win, the higher the score.
+
+    def __init__(self, table_size=1048573):
+        # A prime slot count spreads the structured position keys evenly
+        self.table_size = table_size
+        self.keys = [0] * table_size
+        self.values = [0] * table_size
+        self.nodes = 0
+        self.deadline = None
+        self.stop_event = None
+
+    def solve(self, position, time_budget=None, stop_event=None):
+        self.deadline = None if time_budget is None else time.perf_counter() + time_budget
+        self.stop_event = stop_event
+        self.nodes = 0
+
+        current = position.bitboards[len(position.moves) & 1]
+        return self.solve_bitboards(current, position.mask, len(position.moves))
+
+    def best_move(self, position, time_budget=None, stop_event=None):
+        # Returns (column, score); raises SearchTimeout if the budget runs out first
+        self.deadline = None if time_budget is None else time.perf_counter() + time_budget
+        self.stop_event = stop_event
+        self.nodes = 0
+
+        current = position.bitboards[len(position.moves) & 1]
+        mask = position.mask
+        moves = len(position.moves)
+
+        best_col, best_score = None, None
+        for col in CENTER_ORDER:
+            if mask & TOP_MASKS[col]:
+                continue
+            move = (mask + (1 << col * H1)) & COLUMN_MASKS[col]
+            if winning_cells(current, mask) & move:
+                return col, (CELLS + 1 - moves) // 2
+            score = -self.solve_bitboards(current ^ mask, mask | move, moves + 1)
+            if best_score is None or score > best_score:
+                best_col, best_score = col, score
+        return best_col, best_score
+
+    def solve_bitboards(self, current, mask, moves):
+        if moves == CELLS:
+            return 0
+        if winning_cells(current, mask) & ((mask + BOTTOM_MASK) & BOARD_MASK):
+            return (CELLS + 1 - moves) // 2
+
+        # Narrow the score window with null-window searches until it closes
+        low = -((CELLS - moves) // 2)
+        high = (CELLS + 1 - moves) // 2
+        while low < high:
+            med = low + (high - low) // 2
+            # Scores are symmetric around a draw, so probe closer to 0 first; halves round towards zero
+            if med <= 0 and -(-low // 2) < med:
+                med = -(-low // 2)
+            elif med >= 0 and high // 2 > med:
+                med = high // 2
+            r = self.negamax(current, mask, moves, med, med + 1)
+            if r <= med:
+                high = r
+            else:
+                low = r
+        return low
+
+    def negamax(self, current, mask, moves, alpha, beta):
+        # Precondition: the side to move cannot win immediately
+        self.nodes += 1
+        if not self.nodes & 1023 and (
+            (self.stop_event is not None and self.stop_event.is_set())
+            or (self.deadline is not None and time.perf_counter() > self.deadline)
+        ):
+            raise SearchTimeout
+
+        opponent = current ^ mask
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+        opponent_wins = winning_cells(opponent, mask)
+        forced = possible & opponent_wins
+        if forced:
+            if forced & (forced - 1):
+                return -((CELLS - moves) // 2)  # Two threats to block: lost
+            possible = forced
+        # Never play directly below an opponent's winning cell
+        non_losing = possible & ~(opponent_wins >> 1)
+        if not non_losing:
+            return -((CELLS - moves) // 2)
+
+        if moves >= CELLS - 2:
+            return 0
+
+        low = -((CELLS - 2 - moves) // 2)
+        if alpha < low:
+            alpha = low
+            if alpha >= beta:
+                return alpha
+
+        high = (CELLS - 1 - moves) // 2
+        key = current + mask
+        index = key % self.table_size
+        if self.keys[index] == key:
+            high = self.values[index] + MIN_SCORE - 1
+        if beta > high:
+            beta = high
+            if alpha >= beta:
+                return beta
+
+        # Centre-first, then by how many winning cells the move creates
+        candidates = []
+        for col in CENTER_ORDER:
+            move = non_losing & COLUMN_MASKS[col]
+            if move:
+                threats = winning_cells(current | move, mask).bit_count()
+                candidates.append((threats, move))
+        candidates.sort(key=lambda candidate: -candidate[0])
+
+        for _, move in candidates:
+            score = -self.negamax(opponent, mask | move, moves + 1, -beta, -alpha)
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+
+        # Store an upper bound, offset so a stored 0 means "no entry"
+        self.keys[index] = key
+        self.values[index] = alpha - MIN_SCORE + 1
+        return alpha
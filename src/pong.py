@@ -1,138 +1,139 @@
+import argparse
+import time
+
 import pygame
+
+from pongSim import WIDTH, HEIGHT, STEP, LEFT, Paddle, Game, MultiBallGame, PredictiveBot
+
 pygame.init()
 
 # Difficulty settings: "easy", "medium", or "hard"
 BOT_DIFFICULTY = "medium"
 
-WIDTH, HEIGHT = 700, 500
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Pong with AI")
+# The window, opened by open_window; game rules and state live in pongSim, which needs no display
+WIN = None
+
+# Balls in play; more than one is the multi-ball mode, where they also bounce off each other
+BALLS = 1
+MULTI_BALL_RADIUS = 4
 
+# Frames drawn per second, 0 for uncapped; physics runs at pongSim.PHYSICS_HZ whatever the frame rate
 FPS = 60
+# A longer frame (a stall, the win pause) is clamped rather than replayed as a burst of steps
+MAX_FRAME_TIME = 0.25
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
-
-PADDLE_WIDTH, PADDLE_HEIGHT = 20, 100
-BALL_RADIUS = 7
+PADDLE_COLOR = WHITE
+BALL_COLOR = WHITE
 
 SCORE_FONT = pygame.font.SysFont("comicsans", 50)
-WINNING_SCORE = 10
-
-# Bot behavior settings
-BOT_SETTINGS = {
-    "easy": {"vel": 2, "reaction_threshold": 100},
-    "medium": {"vel": 4, "reaction_threshold": 75},
-    "hard": {"vel": 5, "reaction_threshold": 25}
-}
-
-
-class Paddle:
-    COLOR = WHITE
-    VEL = 4
-
-    def __init__(self, x, y, width, height):
-        self.x = self.original_x = x
-        self.y = self.original_y = y
-        self.width = width
-        self.height = height
-
-    def draw(self, win):
-        pygame.draw.rect(
-            win, self.COLOR, (self.x, self.y, self.width, self.height))
-
-    def move(self, up=True, vel=None):
-        velocity = vel if vel is not None else self.VEL
-        if up:
-            self.y -= velocity
-        else:
-            self.y += velocity
 
-    def reset(self):
-        self.x = self.original_x
-        self.y = self.original_y
 
+def open_window():
+    global WIN
+    WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Pong with AI")
+    return WIN
 
-class Ball:
-    MAX_VEL = 5
-    COLOR = WHITE
 
-    def __init__(self, x, y, radius):
-        self.x = self.original_x = x
-        self.y = self.original_y = y
-        self.radius = radius
-        self.x_vel = self.MAX_VEL
-        self.y_vel = 0
+def draw_paddle(win, paddle, alpha=1.0):
+    # alpha: how far from the previous physics step to the current one to draw
+    y = paddle.previous_y + (paddle.y - paddle.previous_y) * alpha
+    return pygame.draw.rect(win, PADDLE_COLOR, (paddle.x, y, paddle.width, paddle.height))
 
-    def draw(self, win):
-        pygame.draw.circle(win, self.COLOR, (self.x, self.y), self.radius)
 
-    def move(self):
-        self.x += self.x_vel
-        self.y += self.y_vel
+def draw_ball(win, ball, alpha=1.0):
+    x, y = ball.previous
+    center = (x + (ball.x - x) * alpha, y + (ball.y - y) * alpha)
+    return pygame.draw.circle(win, BALL_COLOR, center, ball.radius)
 
-    def reset(self):
-        self.x = self.original_x
-        self.y = self.original_y
-        self.y_vel = 0
-        self.x_vel *= -1
 
+class Timestep:
+    # Turns real frame times into whole fixed physics steps; the remainder is carried to the next
+    # frame and tells the renderer how far to interpolate between the last two steps
+    def __init__(self, step=STEP, max_frame_time=MAX_FRAME_TIME):
+        self.step = step
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
 
-def draw(win, paddles, ball, left_score, right_score):
-    win.fill(BLACK)
+    def advance(self, frame_time):
+        # Number of physics steps due after a frame that took frame_time seconds
+        self.accumulator += min(frame_time, self.max_frame_time)
+        steps = int(self.accumulator // self.step)
+        self.accumulator -= steps * self.step
+        return steps
 
-    left_score_text = SCORE_FONT.render(f"{left_score}", 1, WHITE)
-    right_score_text = SCORE_FONT.render(f"{right_score}", 1, WHITE)
-    win.blit(left_score_text, (WIDTH//4 - left_score_text.get_width()//2, 20))
-    win.blit(right_score_text, (WIDTH * (3/4) - right_score_text.get_width()//2, 20))
+    def alpha(self):
+        return self.accumulator / self.step
 
-    for paddle in paddles:
-        paddle.draw(win)
 
+def draw_center_line(win):
     for i in range(10, HEIGHT, HEIGHT//20):
         if i % 2 == 1:
             continue
         pygame.draw.rect(win, WHITE, (WIDTH//2 - 5, i, 10, HEIGHT//20))
 
-    ball.draw(win)
-    pygame.display.update()
-
-
-def handle_collision(ball, left_paddle, right_paddle):
-    if ball.y + ball.radius >= HEIGHT or ball.y - ball.radius <= 0:
-        ball.y_vel *= -1
-
-    if ball.x_vel < 0:
-        if left_paddle.y <= ball.y <= left_paddle.y + left_paddle.height:
-            if ball.x - ball.radius <= left_paddle.x + left_paddle.width:
-                ball.x_vel *= -1
-                offset = (left_paddle.y + left_paddle.height / 2) - ball.y
-                ball.y_vel = -offset / (left_paddle.height / 2) * ball.MAX_VEL
-    else:
-        if right_paddle.y <= ball.y <= right_paddle.y + right_paddle.height:
-            if ball.x + ball.radius >= right_paddle.x:
-                ball.x_vel *= -1
-                offset = (right_paddle.y + right_paddle.height / 2) - ball.y
-                ball.y_vel = -offset / (right_paddle.height / 2) * ball.MAX_VEL
-
-def handle_paddle_movement(keys, right_paddle):
-    if keys[pygame.K_UP] and right_paddle.y - right_paddle.VEL >= 0:
-        right_paddle.move(up=True)
-    if keys[pygame.K_DOWN] and right_paddle.y + right_paddle.VEL + right_paddle.height <= HEIGHT:
-        right_paddle.move(up=False)
-
-def bot_ai(ball, paddle):
-    settings = BOT_SETTINGS[BOT_DIFFICULTY]
-    reaction_threshold = settings["reaction_threshold"]
-    vel = settings["vel"]
-
-    if ball.x > WIDTH // 2 - reaction_threshold:
-        if ball.y < paddle.y + paddle.height // 2 and paddle.y - vel >= 0:
-            paddle.move(up=True, vel=vel)
-        elif ball.y > paddle.y + paddle.height // 2 and paddle.y + paddle.height + vel <= HEIGHT:
-            paddle.move(up=False, vel=vel)
+
+def draw_scores(win, left_score_text, right_score_text):
+    win.blit(left_score_text, (WIDTH//4 - left_score_text.get_width()//2, 20))
+    win.blit(right_score_text, (WIDTH * (3/4) - right_score_text.get_width()//2, 20))
+
+
+class Renderer:
+    # Draws frames by repairing only what moved. The background, center line and scores are one
+    # pre-rendered layer, rebuilt when a score changes; each frame copies it back over the rectangles
+    # the paddles and ball covered last frame, draws them again, and updates just those rectangles
+    def __init__(self, win):
+        self.win = win
+        self.static = pygame.Surface(win.get_size()).convert()
+        self.static.fill(BLACK)
+        draw_center_line(self.static)
+        self.background = self.static.copy()
+        self.score_texts = {}
+        self.scores = None
+        self.dirty = []
+
+    def score_text(self, score):
+        if score not in self.score_texts:
+            self.score_texts[score] = SCORE_FONT.render(f"{score}", 1, WHITE)
+        return self.score_texts[score]
+
+    def invalidate(self):
+        # Something else drew on the window (the win message): repaint all of it next frame
+        self.scores = None
+
+    def draw(self, paddles, balls, left_score, right_score, alpha=1.0):
+        win = self.win
+        full = self.scores != (left_score, right_score)
+        if full:
+            self.scores = (left_score, right_score)
+            self.background.blit(self.static, (0, 0))
+            draw_scores(self.background, self.score_text(left_score), self.score_text(right_score))
+            win.blit(self.background, (0, 0))
+        else:
+            for rect in self.dirty:
+                win.blit(self.background, rect, rect)
+
+        rects = [draw_paddle(win, paddle, alpha) for paddle in paddles]
+        rects.extend(draw_ball(win, ball, alpha) for ball in balls)
+
+        if full:
+            pygame.display.update()
+        else:
+            # Last frame's rectangles are now background, this frame's hold the sprites
+            pygame.display.update(self.dirty + rects)
+        self.dirty = rects
+
+
+def player_move(keys):
+    # The left paddle's move for this step from the arrow keys held
+    return (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * Paddle.VEL
+
 
 def main():
+    open_window()
+
     def show_menu():
         selected = 1  # 0 = Easy, 1 = Medium, 2 = Hard
         options = ["Easy", "Medium", "Hard"]
@@ -169,60 +170,51 @@ def main():
     run = True
     clock = pygame.time.Clock()
 
-    left_paddle = Paddle(10, HEIGHT//2 - PADDLE_HEIGHT//2, PADDLE_WIDTH, PADDLE_HEIGHT)
-    right_paddle = Paddle(WIDTH - 10 - PADDLE_WIDTH, HEIGHT//2 - PADDLE_HEIGHT//2, PADDLE_WIDTH, PADDLE_HEIGHT)
-    ball = Ball(WIDTH // 2, HEIGHT // 2, BALL_RADIUS)
-
-    left_score = 0
-    right_score = 0
+    game = MultiBallGame(BALLS, MULTI_BALL_RADIUS) if BALLS > 1 else Game()
+    paddles = [game.left_paddle, game.right_paddle]
+    renderer = Renderer(WIN)
+    bot = PredictiveBot.for_difficulty(BOT_DIFFICULTY)
+    timestep = Timestep()
+    last_frame = time.perf_counter()
 
     while run:
         clock.tick(FPS)
-        draw(WIN, [left_paddle, right_paddle], ball, left_score, right_score)
+        now = time.perf_counter()
+        steps = timestep.advance(now - last_frame)
+        last_frame = now
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 run = False
 
+        # Physics advances in fixed steps however long the frame took, so a slow or fast
+        # display changes how often the game is drawn, not how fast it plays
         keys = pygame.key.get_pressed()
-        handle_paddle_movement(keys, left_paddle)
-        bot_ai(ball, right_paddle)
-
-        ball.move()
-        handle_collision(ball, left_paddle, right_paddle)
-
-        if ball.x < 0:
-            right_score += 1
-            ball.reset()
-            left_paddle.reset()
-            right_paddle.reset()
-        elif ball.x > WIDTH:
-            left_score += 1
-            ball.reset()
-            left_paddle.reset()
-            right_paddle.reset()
-
-
-        won = False
-        if left_score >= WINNING_SCORE:
-            win_text = "You Win!"
-            won = True
-        elif right_score >= WINNING_SCORE:
-            win_text = "Bot Wins!"
-            won = True
-
-        if won:
+        for _ in range(steps):
+            game.step(player_move(keys), bot(game.incoming(game.right_paddle), game.right_paddle))
+
+        renderer.draw(paddles, game.balls, game.left_score, game.right_score, timestep.alpha())
+
+        winner = game.winner()
+        if winner:
+            win_text = "You Win!" if winner == LEFT else "Bot Wins!"
             text = SCORE_FONT.render(win_text, 1, WHITE)
             WIN.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 - text.get_height()//2))
             pygame.display.update()
             pygame.time.delay(3000)
-            ball.reset()
-            left_paddle.reset()
-            right_paddle.reset()
-            left_score = 0
-            right_score = 0
+            renderer.invalidate()
+            last_frame = time.perf_counter()
+            game.reset()
 
     pygame.quit()
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pong")
+    parser.add_argument("--fps", type=int, default=FPS, help="frames drawn per second, 0 for uncapped")
+    parser.add_argument("--balls", type=int, default=BALLS, help="balls in play, up to thousands")
+    parser.add_argument("--ball-radius", type=int, default=MULTI_BALL_RADIUS, help="ball radius in multi-ball mode")
+    args = parser.parse_args()
+    FPS = args.fps
+    BALLS = args.balls
+    MULTI_BALL_RADIUS = args.ball_radius
     main()
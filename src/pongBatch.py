@@ -0,0 +1,165 @@
+import numpy as np
+
+from pongSim import WIDTH, HEIGHT, PADDLE_WIDTH, PADDLE_HEIGHT, BALL_RADIUS, WINNING_SCORE, BOT_SETTINGS, Ball
+
+# Who scored in a step, per game
+NO_POINT = 0
+LEFT_POINT = 1
+RIGHT_POINT = 2
+
+LEFT_X = 10
+RIGHT_X = WIDTH - 10 - PADDLE_WIDTH
+PADDLE_Y = HEIGHT//2 - PADDLE_HEIGHT//2
+
+
+class BatchGame:
+    # n independent matches stepped together with array operations, following pongSim.Game step for
+    # step: the same swept collisions, written so each game's numbers come out exactly as Game's would.
+    # A point serves again at the end of the step that scored it, and a match that reaches
+    # WINNING_SCORE is counted in left_wins or right_wins and starts over as Game.reset would.
+    def __init__(self, n):
+        self.n = n
+        self.games = np.arange(n)
+        self.x = np.zeros(n)
+        self.y = np.zeros(n)
+        self.x_vel = np.full(n, float(Ball.MAX_VEL))
+        self.y_vel = np.zeros(n)
+        self.left_y = np.zeros(n)
+        self.right_y = np.zeros(n)
+        self.left_score = np.zeros(n, dtype=np.int64)
+        self.right_score = np.zeros(n, dtype=np.int64)
+        # Totals over every match played
+        self.left_points = np.zeros(n, dtype=np.int64)
+        self.right_points = np.zeros(n, dtype=np.int64)
+        self.left_wins = np.zeros(n, dtype=np.int64)
+        self.right_wins = np.zeros(n, dtype=np.int64)
+        self.serve(self.games)
+        # Game serves towards the right first
+        self.x_vel[:] = Ball.MAX_VEL
+
+    def serve(self, games):
+        self.x[games] = WIDTH // 2
+        self.y[games] = HEIGHT // 2
+        self.x_vel[games] *= -1
+        self.y_vel[games] = 0
+        self.left_y[games] = PADDLE_Y
+        self.right_y[games] = PADDLE_Y
+
+    def move_ball(self):
+        r, h = BALL_RADIUS, PADDLE_HEIGHT
+        remaining = np.ones(self.n)
+        moving = np.ones(self.n, dtype=bool)
+        for _ in range(4):
+            x, y, x_vel, y_vel = self.x, self.y, self.x_vel, self.y_vel
+            hit_time = remaining.copy()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                wall_time = np.maximum(0, (np.where(y_vel < 0, r, HEIGHT - r) - y) / y_vel)
+            wall = (y_vel != 0) & (wall_time < hit_time)
+            hit_time[wall] = wall_time[wall]
+
+            left = x_vel < 0
+            paddle_y = np.where(left, self.left_y, self.right_y)
+            t = np.where(left, (x - r - (LEFT_X + PADDLE_WIDTH)) / -x_vel, (RIGHT_X - x - r) / x_vel)
+            cross = y + y_vel * t
+            paddle = (t >= 0) & (t < hit_time) & (paddle_y <= cross) & (cross <= paddle_y + h)
+            hit_time[paddle] = t[paddle]
+            wall &= ~paddle
+
+            hit_time[~moving] = 0
+            self.x = x + x_vel * hit_time
+            self.y = y + y_vel * hit_time
+            remaining -= hit_time
+            moving &= wall | paddle
+            if not moving.any():
+                return
+            bounce = moving & wall
+            self.y_vel[bounce] *= -1
+            bounce = moving & paddle
+            self.x_vel[bounce] *= -1
+            offset = (paddle_y[bounce] + h / 2) - self.y[bounce]
+            self.y_vel[bounce] = -offset / (h / 2) * Ball.MAX_VEL
+
+    def step(self, left_move=0, right_move=0):
+        # Moves: per-game paddle moves in pixels (or one for every game), kept inside the court.
+        # Returns each game's point for this step
+        self.left_y = np.clip(self.left_y + left_move, 0, HEIGHT - PADDLE_HEIGHT)
+        self.right_y = np.clip(self.right_y + right_move, 0, HEIGHT - PADDLE_HEIGHT)
+        self.move_ball()
+
+        points = np.where(self.x < 0, RIGHT_POINT, np.where(self.x > WIDTH, LEFT_POINT, NO_POINT))
+        scored = self.games[points != NO_POINT]
+        if len(scored):
+            left_point, right_point = points == LEFT_POINT, points == RIGHT_POINT
+            self.left_score += left_point
+            self.right_score += right_point
+            self.left_points += left_point
+            self.right_points += right_point
+            self.serve(scored)
+            left_won = self.left_score >= WINNING_SCORE
+            right_won = self.right_score >= WINNING_SCORE
+            self.left_wins += left_won
+            self.right_wins += right_won
+            over = self.games[left_won | right_won]
+            if len(over):
+                # Like Game.reset after a win, which serves again: the next match opens the other way
+                self.left_score[over] = 0
+                self.right_score[over] = 0
+                self.serve(over)
+        return points
+
+
+class BatchPredictiveBot:
+    # pongSim.PredictiveBot for one side of every game in a BatchGame. vel, reaction_threshold and
+    # error may be per-game arrays, so one batch can try many settings at once; the intercepts of the
+    # games whose ball velocity changed are solved together
+    def __init__(self, n, vel, reaction_threshold, error=0, left=False, seed=None):
+        self.vel = np.broadcast_to(np.asarray(vel, dtype=float), (n,))
+        self.reaction_threshold = np.broadcast_to(np.asarray(reaction_threshold, dtype=float), (n,))
+        self.error = np.broadcast_to(np.asarray(error, dtype=float), (n,))
+        self.left = left
+        self.rng = np.random.default_rng(seed)
+        self.x_vel = np.full(n, np.nan)
+        self.y_vel = np.full(n, np.nan)
+        self.waiting = np.zeros(n, dtype=bool)
+        self.reaction_x = np.zeros(n)
+        self.y = np.zeros(n)
+
+    @classmethod
+    def for_difficulty(cls, n, difficulty, left=False, seed=None):
+        settings = BOT_SETTINGS[difficulty]
+        return cls(n, settings["vel"], settings["reaction_threshold"], settings["error"], left, seed)
+
+    def solve(self, game, games):
+        x_vel, y_vel = game.x_vel[games], game.y_vel[games]
+        self.x_vel[games], self.y_vel[games] = x_vel, y_vel
+        if self.left:
+            waiting = x_vel < 0
+            reaction_x = WIDTH // 2 + self.reaction_threshold[games]
+            face = LEFT_X + PADDLE_WIDTH + BALL_RADIUS
+        else:
+            waiting = x_vel > 0
+            reaction_x = WIDTH // 2 - self.reaction_threshold[games]
+            face = RIGHT_X - BALL_RADIUS
+        self.waiting[games] = waiting
+        self.reaction_x[games] = reaction_x
+
+        # pongSim.intercept_y, for every game at once
+        low = BALL_RADIUS
+        span = HEIGHT - 2 * BALL_RADIUS
+        t = (face - game.x[games]) / x_vel
+        folded = (game.y[games] + y_vel * t - low) % (2 * span)
+        target = low + np.where(folded <= span, folded, 2 * span - folded)
+        error = self.error[games]
+        target += self.rng.uniform(-error, error)
+        target = np.where(waiting, target, HEIGHT / 2)
+        self.y[games] = np.clip(target - PADDLE_HEIGHT / 2, 0, HEIGHT - PADDLE_HEIGHT)
+
+    def __call__(self, game):
+        # The paddle moves for this step
+        x_vel, y_vel = game.x_vel, game.y_vel
+        changed = (x_vel != self.x_vel) | ((y_vel != self.y_vel) & (y_vel != -self.y_vel))
+        if changed.any():
+            self.solve(game, np.flatnonzero(changed))
+        self.waiting &= (game.x - self.reaction_x) * x_vel < 0
+        paddle_y = game.left_y if self.left else game.right_y
+        return np.where(self.waiting, 0, np.clip(self.y - paddle_y, -self.vel, self.vel))
@@ -0,0 +1,382 @@
+import argparse
+import functools
+import os
+import random
+import time
+
+import pongSim
+from pongBatch import BatchGame, BatchPredictiveBot
+from pongSim import Game, MultiBallGame, PredictiveBot
+
+# pong sets up pygame on import, so it is imported once the video driver is chosen
+pong = None
+
+
+# The game's earlier collision, bot and drawing code, which the benchmarks measure the current code against
+
+def handle_collision(ball, left_paddle, right_paddle):
+    # Overlap test at the end of a discrete step, the old collision code; a fast ball can step past
+    # a paddle or out of the court between two tests. The game uses pongSim.move_ball
+    if ball.y + ball.radius >= pongSim.HEIGHT or ball.y - ball.radius <= 0:
+        ball.y_vel *= -1
+
+    if ball.x_vel < 0:
+        if left_paddle.y <= ball.y <= left_paddle.y + left_paddle.height:
+            if ball.x - ball.radius <= left_paddle.x + left_paddle.width:
+                ball.x_vel *= -1
+                offset = (left_paddle.y + left_paddle.height / 2) - ball.y
+                ball.y_vel = -offset / (left_paddle.height / 2) * ball.MAX_VEL
+    else:
+        if right_paddle.y <= ball.y <= right_paddle.y + right_paddle.height:
+            if ball.x + ball.radius >= right_paddle.x:
+                ball.x_vel *= -1
+                offset = (right_paddle.y + right_paddle.height / 2) - ball.y
+                ball.y_vel = -offset / (right_paddle.height / 2) * ball.MAX_VEL
+
+
+def bot_ai(ball, paddle, difficulty="medium"):
+    # Chases the ball's current height; returns the paddle move. The game uses pongSim.PredictiveBot
+    settings = pongSim.BOT_SETTINGS[difficulty]
+    reaction_threshold = settings["reaction_threshold"]
+    vel = settings["vel"]
+
+    if ball.x > pongSim.WIDTH // 2 - reaction_threshold:
+        if ball.y < paddle.y + paddle.height // 2 and paddle.y - vel >= 0:
+            return -vel
+        elif ball.y > paddle.y + paddle.height // 2 and paddle.y + paddle.height + vel <= pongSim.HEIGHT:
+            return vel
+    return 0
+
+
+def full_draw(win, paddles, ball, left_score, right_score):
+    # Redraws the whole window every frame, the old drawing code; the game uses pong.Renderer
+    win.fill(pong.BLACK)
+
+    left_score_text = pong.SCORE_FONT.render(f"{left_score}", 1, pong.WHITE)
+    right_score_text = pong.SCORE_FONT.render(f"{right_score}", 1, pong.WHITE)
+    pong.draw_scores(win, left_score_text, right_score_text)
+
+    for paddle in paddles:
+        pong.draw_paddle(win, paddle)
+
+    pong.draw_center_line(win)
+
+    pong.draw_ball(win, ball)
+    pong.pygame.display.update()
+
+
+def collide_pairwise(balls):
+    # Tests every pair of balls, O(N^2) per step; MultiBallGame uses pongSim.collide_hashed. Returns
+    # the number of bounces
+    bounces = 0
+    for i, a in enumerate(balls):
+        for b in balls[i + 1:]:
+            bounces += pongSim.collide_balls(a, b)
+    return bounces
+
+
+class PairwiseGame(MultiBallGame):
+    # MultiBallGame with its ball-ball collisions tested pair by pair
+    def collide(self):
+        collide_pairwise(self.balls)
+
+
+def track(ball, paddle):
+    # Left-side stand-in for the player: follow the ball at paddle speed
+    vel = paddle.VEL
+    if ball.y < paddle.y + paddle.height // 2 and paddle.y - vel >= 0:
+        return -vel
+    elif ball.y > paddle.y + paddle.height // 2 and paddle.y + paddle.height + vel <= pongSim.HEIGHT:
+        return vel
+    return 0
+
+
+def play(frames, draw):
+    # Plays `frames` frames with both paddles automated, timing the draw call of each
+    game = Game()
+    paddles = [game.left_paddle, game.right_paddle]
+    bot = PredictiveBot.for_difficulty("medium", random.Random(0))
+    times = []
+
+    for _ in range(frames):
+        start = time.perf_counter()
+        draw(paddles, game.balls, game.left_score, game.right_score)
+        times.append(time.perf_counter() - start)
+        pong.pygame.event.pump()
+
+        game.step(track(game.ball, game.left_paddle), bot(game.ball, game.right_paddle))
+    return times
+
+
+def bench_render(args):
+    budget = 1000 / pong.FPS
+    pong.open_window()
+    renderer = pong.Renderer(pong.WIN)
+    draws = {
+        "full": lambda paddles, balls, left, right: full_draw(pong.WIN, paddles, balls[0], left, right),
+        "dirty": renderer.draw,
+    }
+    print(f"{args.frames} frames, {budget:.1f} ms frame budget")
+    print(f"{'renderer':>9} {'mean ms':>8} {'p95 ms':>7} {'max ms':>7} {'budget used':>12}")
+    for name, draw in draws.items():
+        times = sorted(play(args.frames, draw))
+        mean = sum(times) / len(times) * 1000
+        p95 = times[int(0.95 * len(times))] * 1000
+        print(f"{name:>9} {mean:>8.3f} {p95:>7.3f} {times[-1] * 1000:>7.3f} {mean / budget:>11.1%}")
+
+
+def simulate(seconds, frame_times, fixed, max_steps=None):
+    # Plays `seconds` of game time, or up to max_steps steps, with frames of the given durations
+    # (cycled); the old loop runs one step per frame, the fixed loop as many steps as the frame's time
+    # is worth. Returns steps run and the ball's position
+    game = Game()
+    bot = PredictiveBot.for_difficulty("medium", random.Random(0))
+    timestep = pong.Timestep()
+    elapsed = 0.0
+    steps = 0
+    frame = 0
+    while elapsed < seconds:
+        frame_time = frame_times[frame % len(frame_times)]
+        frame += 1
+        elapsed += frame_time
+        for _ in range(timestep.advance(frame_time) if fixed else 1):
+            if steps == max_steps:
+                break
+            game.step(track(game.ball, game.left_paddle), bot(game.ball, game.right_paddle))
+            steps += 1
+    return steps, game.ball.x, game.ball.y
+
+
+def returned(ball, paddle, swept):
+    # Whether a ball heading left comes back off a paddle placed squarely in its path
+    other = pongSim.Paddle(pongSim.WIDTH + 100, 0, pongSim.PADDLE_WIDTH, pongSim.PADDLE_HEIGHT)
+    while ball.x_vel < 0:
+        if swept:
+            pongSim.move_ball(ball, paddle, other)
+        else:
+            ball.move()
+            handle_collision(ball, paddle, other)
+        if ball.x < 0:
+            return False
+    return True
+
+
+def bench_timestep(args):
+    rng = random.Random(args.seed)
+    rates = {"30 Hz": [1 / 30], "60 Hz": [1 / 60], "144 Hz": [1 / 144],
+             "jitter": [rng.uniform(0.004, 0.045) for _ in range(997)]}
+    print(f"{args.seconds:g} s of play; physics at {pongSim.PHYSICS_HZ} Hz")
+    print(f"{'frames':>8} {'old steps/s':>12} {'fixed steps/s':>14} {'fixed ball after 600 steps':>27}")
+    for name, frame_times in rates.items():
+        old_steps, _, _ = simulate(args.seconds, frame_times, fixed=False)
+        fixed_steps, _, _ = simulate(args.seconds, frame_times, fixed=True)
+        # Equal step counts give equal states: the trajectory does not depend on the frame rate
+        _, x, y = simulate(args.seconds, frame_times, fixed=True, max_steps=600)
+        print(f"{name:>8} {old_steps / args.seconds:>12.0f} {fixed_steps / args.seconds:>14.0f} {f'({x:.1f}, {y:.1f})':>27}")
+
+    print()
+    print(f"balls returned by a paddle in their path, of {args.trials}")
+    print(f"{'speed px/step':>14} {'discrete':>9} {'swept':>6}")
+    for speed in args.speeds:
+        counts = {False: 0, True: 0}
+        for _ in range(args.trials):
+            x = rng.uniform(pongSim.WIDTH / 3, pongSim.WIDTH * 2 / 3)
+            y_vel = rng.uniform(-0.3, 0.3) * speed
+            face = 10 + pongSim.PADDLE_WIDTH
+            cross_y = pongSim.HEIGHT / 2 + y_vel * (x - pongSim.BALL_RADIUS - face) / speed
+            paddle_y = cross_y - rng.uniform(0, pongSim.PADDLE_HEIGHT)
+            for swept in counts:
+                ball = pongSim.Ball(x, pongSim.HEIGHT / 2, pongSim.BALL_RADIUS)
+                ball.x_vel, ball.y_vel = -speed, y_vel
+                paddle = pongSim.Paddle(10, paddle_y, pongSim.PADDLE_WIDTH, pongSim.PADDLE_HEIGHT)
+                counts[swept] += returned(ball, paddle, swept)
+        print(f"{speed:>14} {counts[False]:>9} {counts[True]:>6}")
+
+
+def rally(bot, shots, seed):
+    # Right-side bot against a left side that returns everything at varied angles; returns the share
+    # of shots the bot got back and the ball states it was called with
+    rng = random.Random(seed)
+    game = Game()
+    ball = game.ball
+    server = PredictiveBot(vel=50, reaction_threshold=pongSim.WIDTH, error=45, rng=rng)
+    returned = missed = 0
+    states = []
+    while returned + missed < shots:
+        left_move = server(ball, game.left_paddle)
+        states.append((ball.x, ball.y, ball.x_vel, ball.y_vel))
+        right_move = bot(ball, game.right_paddle)
+
+        x_vel = ball.x_vel
+        scorer = game.step(left_move, right_move)
+        if scorer:
+            missed += scorer == pongSim.LEFT
+        elif x_vel > 0 and ball.x_vel < 0:
+            returned += 1
+    return returned / shots, states
+
+
+def time_per_call(bot, states):
+    # Replays the recorded ball states through the bot, less the cost of the replay loop itself, in microseconds
+    def replay(bot):
+        game = Game()
+        ball, paddle = game.ball, game.right_paddle
+        start = time.perf_counter()
+        for ball.x, ball.y, ball.x_vel, ball.y_vel in states:
+            bot(ball, paddle)
+        return time.perf_counter() - start
+
+    return (min(replay(bot) for _ in range(9)) - min(replay(lambda ball, paddle: None) for _ in range(9))) / len(states) * 1e6
+
+
+def bench_bot(args):
+    print(f"{args.shots} shots at the bot per difficulty")
+    print(f"{'difficulty':>10} {'chaser returns':>15} {'us/call':>8} {'predictive returns':>19} {'us/call':>8}")
+    for difficulty in pongSim.BOT_SETTINGS:
+        chaser = functools.partial(bot_ai, difficulty=difficulty)
+        chaser_rate, states = rally(chaser, args.shots, args.seed)
+        chaser_us = time_per_call(chaser, states)
+        predictive, states = rally(PredictiveBot.for_difficulty(difficulty, random.Random(args.seed)), args.shots, args.seed)
+        predictive_us = time_per_call(PredictiveBot.for_difficulty(difficulty, random.Random(args.seed)), states)
+        print(f"{difficulty:>10} {chaser_rate:>15.1%} {chaser_us:>8.3f} {predictive:>19.1%} {predictive_us:>8.3f}")
+
+
+def bench_sim(args):
+    # Game logic alone, no pygame: one Game between two predictive bots, then NumPy batches of matches
+    left = PredictiveBot.for_difficulty(args.difficulty, random.Random(args.seed))
+    right = PredictiveBot.for_difficulty(args.difficulty, random.Random(args.seed + 1))
+    game = Game()
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        game.step(left(game.ball, game.left_paddle), right(game.ball, game.right_paddle))
+        if game.winner():
+            game.reset()
+    elapsed = time.perf_counter() - start
+    print(f"{args.difficulty} against {args.difficulty}")
+    print(f"{'games':>7} {'steps/s':>12}")
+    print(f"{'scalar':>7} {args.steps / elapsed:>12.0f}")
+
+    for n in args.batch:
+        batch = BatchGame(n)
+        left = BatchPredictiveBot.for_difficulty(n, args.difficulty, left=True, seed=args.seed)
+        right = BatchPredictiveBot.for_difficulty(n, args.difficulty, seed=args.seed + 1)
+        ticks = max(1, args.steps // n)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            batch.step(left(batch), right(batch))
+        elapsed = time.perf_counter() - start
+        print(f"{n:>7} {ticks * n / elapsed:>12.0f}")
+
+
+def bench_matches(args):
+    # How the left bot fares against the right for every pairing of BOT_SETTINGS difficulties, each
+    # pairing played as one batch; edit BOT_SETTINGS and rerun to tune the difficulties against each other
+    difficulties = list(pongSim.BOT_SETTINGS)
+    ticks = int(args.seconds * pongSim.PHYSICS_HZ)
+    print(f"{args.games} games of {args.seconds:g} s per pairing")
+    print("left bot's share of points, points per game-minute, and its share of finished matches")
+    print(f"{'left/right':>10} " + " ".join(f"{d:>24}" for d in difficulties))
+    total_steps = 0
+    start = time.perf_counter()
+    for i, left_difficulty in enumerate(difficulties):
+        row = []
+        for j, right_difficulty in enumerate(difficulties):
+            seed = args.seed + 2 * (i * len(difficulties) + j)
+            batch = BatchGame(args.games)
+            left = BatchPredictiveBot.for_difficulty(args.games, left_difficulty, left=True, seed=seed)
+            right = BatchPredictiveBot.for_difficulty(args.games, right_difficulty, seed=seed + 1)
+            for _ in range(ticks):
+                batch.step(left(batch), right(batch))
+            total_steps += ticks * args.games
+
+            points = batch.left_points.sum() + batch.right_points.sum()
+            matches = batch.left_wins.sum() + batch.right_wins.sum()
+            point_share = batch.left_points.sum() / points if points else 0
+            match_share = f"{batch.left_wins.sum() / matches:.1%}" if matches else "-"
+            per_minute = points / args.games / (args.seconds / 60)
+            row.append(f"{point_share:>7.1%} {per_minute:>7.2f} {match_share:>8}")
+        print(f"{left_difficulty:>10} " + " ".join(row))
+    elapsed = time.perf_counter() - start
+    print(f"{total_steps} steps in {elapsed:.1f} s, {total_steps / elapsed:.0f} steps/s")
+
+
+def step_time(game_class, balls, radius, steps, seed):
+    # Mean seconds per physics step of a multi-ball game between two chasing bots
+    game = game_class(balls, radius, random.Random(seed))
+    times = []
+    for _ in range(steps):
+        left = bot_ai(game.incoming(game.left_paddle), game.left_paddle)
+        right = bot_ai(game.incoming(game.right_paddle), game.right_paddle)
+        start = time.perf_counter()
+        game.step(left, right)
+        times.append(time.perf_counter() - start)
+    return sum(times) / steps
+
+
+def bench_multiball(args):
+    # Physics time per frame as the number of balls grows, spatial hash against testing every pair;
+    # ms per ball staying flat is the hash keeping ball-ball collisions near-linear
+    print(f"{args.steps} steps per count, balls of radius {args.radius}, {1000 / pongSim.PHYSICS_HZ:.1f} ms frame budget")
+    print(f"{'balls':>6} {'hash ms':>8} {'us/ball':>8} {'pairwise ms':>12} {'us/ball':>8}")
+    for balls in args.balls:
+        hashed = step_time(MultiBallGame, balls, args.radius, args.steps, args.seed) * 1000
+        line = f"{balls:>6} {hashed:>8.3f} {hashed / balls * 1000:>8.3f}"
+        if balls <= args.pairwise_max:
+            pairwise = step_time(PairwiseGame, balls, args.radius, args.steps, args.seed) * 1000
+            line += f" {pairwise:>12.3f} {pairwise / balls * 1000:>8.3f}"
+        print(line)
+
+
+def main():
+    global pong
+    parser = argparse.ArgumentParser(description="Pong benchmarks")
+    parser.add_argument("--headless", action="store_true", help="use SDL's dummy video driver, measuring drawing without the display")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    render = subparsers.add_parser("render", help="draw time per frame, full redraw against cached layers and dirty rectangles")
+    render.add_argument("--frames", type=int, default=3000)
+    render.set_defaults(func=bench_render)
+
+    timestep = subparsers.add_parser("timestep", help="physics rate across frame rates, and tunnelling at high ball speeds")
+    timestep.add_argument("--seconds", type=float, default=60)
+    timestep.add_argument("--speeds", type=int, nargs="+", default=[5, 15, 30, 60, 120])
+    timestep.add_argument("--trials", type=int, default=1000)
+    timestep.add_argument("--seed", type=int, default=1)
+    timestep.set_defaults(func=bench_timestep)
+
+    bot = subparsers.add_parser("bot", help="return rate and time per call, chasing bot against the predictive bot")
+    bot.add_argument("--shots", type=int, default=2000)
+    bot.add_argument("--seed", type=int, default=1)
+    bot.set_defaults(func=bench_bot)
+
+    sim = subparsers.add_parser("sim", help="headless game logic steps/sec, scalar and batched")
+    sim.add_argument("--steps", type=int, default=1000000, help="steps per measurement")
+    sim.add_argument("--batch", type=int, nargs="+", default=[100, 1000, 10000])
+    sim.add_argument("--difficulty", choices=tuple(pongSim.BOT_SETTINGS), default="medium")
+    sim.add_argument("--seed", type=int, default=1)
+    sim.set_defaults(func=bench_sim)
+
+    matches = subparsers.add_parser("matches", help="match win rates between bot difficulties, batched")
+    matches.add_argument("--games", type=int, default=10000, help="games played at once per pairing")
+    matches.add_argument("--seconds", type=float, default=120, help="game time each game is played for")
+    matches.add_argument("--seed", type=int, default=1)
+    matches.set_defaults(func=bench_matches)
+
+    multiball = subparsers.add_parser("multiball", help="physics time per frame by ball count, spatial hash against all pairs")
+    multiball.add_argument("--balls", type=int, nargs="+", default=[125, 250, 500, 1000, 2000, 4000])
+    multiball.add_argument("--radius", type=int, default=2)
+    multiball.add_argument("--steps", type=int, default=200)
+    multiball.add_argument("--pairwise-max", type=int, default=1000, help="largest count to time testing every pair at")
+    multiball.add_argument("--seed", type=int, default=1)
+    multiball.set_defaults(func=bench_multiball)
+
+    args = parser.parse_args()
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    if args.func in (bench_render, bench_timestep):
+        import pong
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+import math
+import random
+
+WIDTH, HEIGHT = 700, 500
+
+PHYSICS_HZ = 60
+STEP = 1 / PHYSICS_HZ
+
+PADDLE_WIDTH, PADDLE_HEIGHT = 20, 100
+BALL_RADIUS = 7
+
+WINNING_SCORE = 10
+
+# Bot behavior settings; error: the most the bot's aim point can be off, in pixels, drawn once per shot.
+# The paddle still covers the ball while its aim is off by less than half its height, so only errors
+# above PADDLE_HEIGHT / 2 can miss; tuned with pongBench.py bot and matches
+BOT_SETTINGS = {
+    "easy": {"vel": 2, "reaction_threshold": 100, "error": 80},
+    "medium": {"vel": 4, "reaction_threshold": 75, "error": 62},
+    "hard": {"vel": 5, "reaction_threshold": 25, "error": 52}
+}
+
+# Who scored in a step
+LEFT = "left"
+RIGHT = "right"
+
+# Slowest horizontal speed a ball is left with after hitting another, so none drifts up and down forever
+MIN_X_VEL = 1
+# Cells around a grid cell that come after it, so each neighbouring pair of cells is visited once
+FORWARD_CELLS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class Paddle:
+    __slots__ = ("x", "y", "original_x", "original_y", "width", "height", "previous_y")
+    VEL = 4
+
+    def __init__(self, x, y, width, height):
+        self.x = self.original_x = x
+        self.y = self.original_y = y
+        self.width = width
+        self.height = height
+        self.previous_y = y
+
+    def remember(self):
+        self.previous_y = self.y
+
+    def shift(self, dy):
+        self.y = min(max(self.y + dy, 0), HEIGHT - self.height)
+
+    def reset(self):
+        self.x = self.original_x
+        self.y = self.original_y
+        self.previous_y = self.y
+
+
+class Ball:
+    __slots__ = ("x", "y", "original_x", "original_y", "radius", "x_vel", "y_vel", "previous")
+    MAX_VEL = 5
+
+    def __init__(self, x, y, radius):
+        self.x = self.original_x = x
+        self.y = self.original_y = y
+        self.radius = radius
+        self.x_vel = self.MAX_VEL
+        self.y_vel = 0
+        self.previous = (x, y)
+
+    def remember(self):
+        self.previous = (self.x, self.y)
+
+    def move(self, fraction=1.0):
+        self.x += self.x_vel * fraction
+        self.y += self.y_vel * fraction
+
+    def reset(self):
+        self.x = self.original_x
+        self.y = self.original_y
+        self.previous = (self.x, self.y)
+        self.y_vel = 0
+        self.x_vel *= -1
+
+
+def move_ball(ball, left_paddle, right_paddle):
+    # One physics step with continuous collision detection: the ball's path over the step is swept
+    # against the walls and the paddle it is heading for, and bounces off the earliest contact
+    remaining = 1.0
+    for _ in range(4):
+        hit_time, hit = remaining, None
+        if ball.y_vel:
+            wall_y = ball.radius if ball.y_vel < 0 else HEIGHT - ball.radius
+            t = max(0, (wall_y - ball.y) / ball.y_vel)
+            if t < hit_time:
+                hit_time, hit = t, "wall"
+
+        if ball.x_vel < 0:
+            paddle = left_paddle
+            t = (ball.x - ball.radius - (paddle.x + paddle.width)) / -ball.x_vel
+        else:
+            paddle = right_paddle
+            t = (paddle.x - ball.x - ball.radius) / ball.x_vel
+        # A ball already past the paddle's face has been missed
+        if 0 <= t < hit_time and paddle.y <= ball.y + ball.y_vel * t <= paddle.y + paddle.height:
+            hit_time, hit = t, paddle
+
+        ball.move(hit_time)
+        remaining -= hit_time
+        if hit is None:
+            return
+        if hit == "wall":
+            ball.y_vel *= -1
+        else:
+            ball.x_vel *= -1
+            offset = (paddle.y + paddle.height / 2) - ball.y
+            ball.y_vel = -offset / (paddle.height / 2) * ball.MAX_VEL
+
+
+class Game:
+    # One match with no display: paddles and ball in court pixels, advanced one fixed physics step at a time
+    def __init__(self):
+        self.left_paddle = Paddle(10, HEIGHT//2 - PADDLE_HEIGHT//2, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.right_paddle = Paddle(WIDTH - 10 - PADDLE_WIDTH, HEIGHT//2 - PADDLE_HEIGHT//2, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.ball = Ball(WIDTH // 2, HEIGHT // 2, BALL_RADIUS)
+        # Every ball in play; MultiBallGame has more than one
+        self.balls = [self.ball]
+        self.left_score = 0
+        self.right_score = 0
+
+    def serve(self):
+        self.ball.reset()
+        self.left_paddle.reset()
+        self.right_paddle.reset()
+
+    def reset(self):
+        self.serve()
+        self.left_score = 0
+        self.right_score = 0
+
+    def step(self, left_move=0, right_move=0):
+        # Moves each paddle by its input in pixels (kept inside the court), then the ball; returns
+        # LEFT or RIGHT when that side scores, after serving again
+        for body in (self.left_paddle, self.right_paddle, self.ball):
+            body.remember()
+        self.left_paddle.shift(left_move)
+        self.right_paddle.shift(right_move)
+        move_ball(self.ball, self.left_paddle, self.right_paddle)
+
+        if self.ball.x < 0:
+            self.right_score += 1
+            scorer = RIGHT
+        elif self.ball.x > WIDTH:
+            self.left_score += 1
+            scorer = LEFT
+        else:
+            return None
+        self.serve()
+        return scorer
+
+    def winner(self):
+        if self.left_score >= WINNING_SCORE:
+            return LEFT
+        if self.right_score >= WINNING_SCORE:
+            return RIGHT
+        return None
+
+    def incoming(self, paddle):
+        # The ball a bot guarding paddle should play
+        return self.ball
+
+
+def collide_balls(a, b):
+    # Elastic bounce between two touching balls of equal mass: the velocity components along the line
+    # between their centers are exchanged. Balls that overlap but already move apart are left alone
+    dx, dy = b.x - a.x, b.y - a.y
+    reach = a.radius + b.radius
+    distance = dx * dx + dy * dy
+    if distance >= reach * reach or distance == 0:
+        return False
+    along = ((b.x_vel - a.x_vel) * dx + (b.y_vel - a.y_vel) * dy) / distance
+    if along >= 0:
+        return False
+    a.x_vel += along * dx
+    a.y_vel += along * dy
+    b.x_vel -= along * dx
+    b.y_vel -= along * dy
+    for ball in (a, b):
+        if -MIN_X_VEL < ball.x_vel < MIN_X_VEL:
+            ball.x_vel = MIN_X_VEL if ball.x_vel >= 0 else -MIN_X_VEL
+    return True
+
+
+def collide_hashed(balls, cell_size):
+    # Buckets the balls in a uniform grid of cells at least a ball's diameter wide, so touching balls
+    # are always in the same or adjacent cells, and tests only those pairs: about O(N) per step while
+    # the balls are spread out. Returns the number of bounces
+    grid = {}
+    for ball in balls:
+        key = (int(ball.x // cell_size), int(ball.y // cell_size))
+        cell = grid.get(key)
+        if cell is None:
+            grid[key] = [ball]
+        else:
+            cell.append(ball)
+
+    bounces = 0
+    for (cx, cy), cell in grid.items():
+        for i, a in enumerate(cell):
+            for b in cell[i + 1:]:
+                bounces += collide_balls(a, b)
+        for dx, dy in FORWARD_CELLS:
+            other = grid.get((cx + dx, cy + dy))
+            if other:
+                for a in cell:
+                    for b in other:
+                        bounces += collide_balls(a, b)
+    return bounces
+
+
+class MultiBallGame(Game):
+    # Game with many balls in play at once that also bounce off each other, for stress testing. A ball
+    # that gets past a paddle scores and is served again from the middle on its own; the paddles stay put
+    def __init__(self, balls, radius=BALL_RADIUS, rng=None):
+        super().__init__()
+        self.rng = rng if rng is not None else random.Random()
+        self.radius = radius
+        self.balls = [Ball(WIDTH // 2, HEIGHT // 2, radius) for _ in range(balls)]
+        self.ball = self.balls[0]
+        self.spread()
+
+    def spread(self):
+        # Scatters the balls over the middle half of the court, in random directions
+        for ball in self.balls:
+            ball.x = self.rng.uniform(WIDTH / 4, WIDTH * 3 / 4)
+            ball.y = self.rng.uniform(self.radius, HEIGHT - self.radius)
+            ball.previous = (ball.x, ball.y)
+            ball.x_vel = self.rng.choice((-1, 1)) * Ball.MAX_VEL
+            ball.y_vel = self.rng.uniform(-Ball.MAX_VEL, Ball.MAX_VEL)
+
+    def serve(self):
+        self.left_paddle.reset()
+        self.right_paddle.reset()
+        self.spread()
+
+    def winner(self):
+        # Points come too fast for a match to mean much: play goes on and the scores just count
+        return None
+
+    def serve_ball(self, ball):
+        # Towards the side that just scored, like Ball.reset, at a random angle
+        ball.reset()
+        ball.x_vel = math.copysign(Ball.MAX_VEL, ball.x_vel)
+        ball.y_vel = self.rng.uniform(-Ball.MAX_VEL, Ball.MAX_VEL)
+
+    def collide(self):
+        collide_hashed(self.balls, 2 * self.radius)
+
+    def step(self, left_move=0, right_move=0):
+        # Returns who scored each point this step, empty when nobody did
+        left_paddle, right_paddle = self.left_paddle, self.right_paddle
+        left_paddle.remember()
+        right_paddle.remember()
+        left_paddle.shift(left_move)
+        right_paddle.shift(right_move)
+        for ball in self.balls:
+            ball.remember()
+            move_ball(ball, left_paddle, right_paddle)
+        self.collide()
+
+        scorers = []
+        for ball in self.balls:
+            if ball.x < 0:
+                self.right_score += 1
+                scorers.append(RIGHT)
+            elif ball.x > WIDTH:
+                self.left_score += 1
+                scorers.append(LEFT)
+            else:
+                continue
+            self.serve_ball(ball)
+        return scorers
+
+    def incoming(self, paddle):
+        # The first ball due at paddle's face, or with none heading its way the nearest one
+        left = paddle.x < WIDTH / 2
+        face = paddle.x + paddle.width if left else paddle.x
+        best, best_time = None, math.inf
+        for ball in self.balls:
+            if (ball.x_vel < 0) == left:
+                t = (face - ball.x) / ball.x_vel
+                if 0 <= t < best_time:
+                    best, best_time = ball, t
+        if best is None:
+            best = min(self.balls, key=lambda ball: abs(ball.x - face))
+        return best
+
+
+def intercept_y(ball, x):
+    # Height at which the ball's center reaches x, folding its straight path back into the court at
+    # each wall it would bounce off; move_ball reflects exactly at these lines, so this is exact
+    t = (x - ball.x) / ball.x_vel
+    low = ball.radius
+    span = HEIGHT - 2 * ball.radius
+    y = (ball.y + ball.y_vel * t - low) % (2 * span)
+    return low + (y if y <= span else 2 * span - y)
+
+
+class PredictiveBot:
+    # Moves its paddle to where the ball will meet the paddle's face. The intercept is solved only when
+    # the ball's velocity changes other than by a wall bounce, that is at a paddle hit or a serve, and
+    # the paddle position it needs is cached until then; between those a step is a comparison and a move
+    def __init__(self, vel, reaction_threshold, error=0, rng=None):
+        self.vel = vel
+        self.reaction_threshold = reaction_threshold
+        self.error = error
+        self.rng = rng if rng is not None else random.Random()
+        self.x_vel = self.y_vel = None
+        self.waiting = False
+        self.y = None
+
+    @classmethod
+    def for_difficulty(cls, difficulty, rng=None):
+        settings = BOT_SETTINGS[difficulty]
+        return cls(settings["vel"], settings["reaction_threshold"], settings["error"], rng)
+
+    def solve(self, ball, paddle):
+        self.x_vel, self.y_vel = ball.x_vel, ball.y_vel
+        left = paddle.x < WIDTH / 2
+        # Like the old chasing bot, leave an incoming ball until it crosses the reaction line
+        self.waiting = (ball.x_vel < 0) == left
+        if self.waiting:
+            self.reaction_x = WIDTH // 2 + self.reaction_threshold if left else WIDTH // 2 - self.reaction_threshold
+            face = paddle.x + paddle.width + ball.radius if left else paddle.x - ball.radius
+            target = intercept_y(ball, face) + self.rng.uniform(-self.error, self.error)
+        else:
+            # Heading for the other side: wait in the middle
+            target = HEIGHT / 2
+        self.y = min(max(target - paddle.height / 2, 0), HEIGHT - paddle.height)
+
+    def __call__(self, ball, paddle):
+        # The paddle move for this step
+        if ball.x_vel != self.x_vel or (ball.y_vel != self.y_vel and ball.y_vel != -self.y_vel):
+            self.solve(ball, paddle)
+        if self.waiting:
+            if (ball.x - self.reaction_x) * ball.x_vel < 0:
+                return 0
+            self.waiting = False
+        distance = self.y - paddle.y
+        if distance > self.vel:
+            return self.vel
+        if distance < -self.vel:
+            return -self.vel
+        return distance
@@ -1,110 +1,262 @@
-import random
+import argparse
+import time
+from collections import deque
 from tkinter import *
 
-GAME_WIDTH = 480
-GAME_HEIGHT = 480
-SPEED = 80
+from snakePilot import Autopilot, BUDGET
+from snakeSim import Game, MOVED, DIED, WON
+
+COLUMNS = 12
+ROWS = 12
 SPACE_SIZE = 40
+GAME_WIDTH = COLUMNS * SPACE_SIZE
+GAME_HEIGHT = ROWS * SPACE_SIZE
+# --large: columns, rows and cell size
+LARGE_GRID = (200, 200, 4)
+SPEED = 80  # ms per tick at score 0
+# Each point multiplies the tick interval by SPEED_UP, down to MIN_SPEED ms; 1.0 keeps a constant pace
+SPEED_UP = 1.0
+MIN_SPEED = 40
+# Ticks run in one callback when the loop has fallen behind; beyond that the schedule restarts from now
+MAX_CATCH_UP = 5
 BODY_PARTS = 3
 SNAKE_COLOR = "#0000FF"
 FOOD_COLOR = "#FF0000"
 BACKGROUND_COLOR = "#000000"
 
-class Snake:
-    def __init__(self):
-        self.body_size = BODY_PARTS
-        self.coordinates = []
-        self.squares = []
-
-        for _ in range(BODY_PARTS):
-            self.coordinates.append([0, 0])
-
-        for x, y in self.coordinates:
-            square = canvas.create_rectangle(x, y, x + SPACE_SIZE, y + SPACE_SIZE, fill=SNAKE_COLOR, tag="snake")
-            self.squares.append(square)
-
-class Food:
-    def __init__(self, snake):
-        while True:
-            x = random.randint(0, (GAME_WIDTH // SPACE_SIZE) - 1) * SPACE_SIZE
-            y = random.randint(0, (GAME_HEIGHT // SPACE_SIZE) - 1) * SPACE_SIZE
-            if [x, y] not in snake.coordinates:
-                break
-        self.coordinates = [x, y]
-        canvas.create_rectangle(x, y, x + SPACE_SIZE, y + SPACE_SIZE, fill=FOOD_COLOR, tag="Food")
-
-
+# "image" paints cells into one pre-built PhotoImage, so a tick redraws the tail, head and food cells
+# whatever the grid size or snake length. "recycle" moves the tail's canvas item to the head and "create"
+# makes a new item every tick, the old renderer; both keep one item per segment, so Tk's redraw slows
+# as the snake grows. They are kept for comparison in snakeBench.py
+RENDERER = "image"
 
-def next_turn(snake, food):
-    global direction, score
-
-    x, y = snake.coordinates[0]
+class TickStats:
+    # How late each tick ran against its deadline, for the current game
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.lateness = []
+        self.catch_up = 0
+        self.dropped = 0
+
+    def record(self, lateness):
+        self.lateness.append(lateness)
+
+    def summary(self):
+        values = sorted(self.lateness)
+        if not values:
+            return {"ticks": 0}
+        return {
+            "ticks": len(values),
+            "mean_ms": sum(values) / len(values) * 1000,
+            "p95_ms": values[min(len(values) - 1, int(0.95 * len(values)))] * 1000,
+            "max_ms": values[-1] * 1000,
+            "catch_up": self.catch_up,
+            "dropped": self.dropped,
+        }
+
+tick_stats = TickStats()
+print_tick_stats = False
+
+# Toggled with the A key; None while the player steers
+autopilot = None
+pilot_budget = BUDGET
+
+def configure_grid(columns, rows, cell_size):
+    global COLUMNS, ROWS, SPACE_SIZE, GAME_WIDTH, GAME_HEIGHT
+    COLUMNS, ROWS, SPACE_SIZE = columns, rows, cell_size
+    GAME_WIDTH = columns * cell_size
+    GAME_HEIGHT = rows * cell_size
+
+def cell_rect(x, y):
+    return x * SPACE_SIZE, y * SPACE_SIZE, (x + 1) * SPACE_SIZE, (y + 1) * SPACE_SIZE
+
+class Board:
+    # The image renderer's surface: one PhotoImage over the grid behind a single canvas item, built once
+    # per canvas; a new game blanks it instead of rebuilding anything
+    def __init__(self):
+        self.image = PhotoImage(width=GAME_WIDTH, height=GAME_HEIGHT)
+        self.item = canvas.create_image(0, 0, image=self.image, anchor=NW)
 
-    if direction == "up":
-        y -= SPACE_SIZE
-    elif direction == "down":
-        y += SPACE_SIZE
-    elif direction == "left":
-        x -= SPACE_SIZE
-    elif direction == "right":
-        x += SPACE_SIZE
+    def fill(self, x, y, color):
+        self.image.put(color, to=cell_rect(x, y))
 
-    snake.coordinates.insert(0, [x, y])
+    def clear(self):
+        # Blank pixels are transparent, showing the canvas background
+        self.image.blank()
 
-    square = canvas.create_rectangle(x, y, x + SPACE_SIZE, y + SPACE_SIZE, fill=SNAKE_COLOR)
+    def show(self, visible):
+        canvas.itemconfigure(self.item, state=NORMAL if visible else HIDDEN)
 
-    snake.squares.insert(0, square)
+board = None
 
-    if x == food.coordinates[0] and y == food.coordinates[1]:
-        score += 1
-        label.config(text="Score:{}".format(score))
+class Snake:
+    # The game's body on the canvas: painted cells, or one item per segment, head first
+    def __init__(self, game):
+        self.game = game
+        self.squares = deque()
+
+        for x, y in game.coordinates:
+            if RENDERER == "image":
+                board.fill(x, y, SNAKE_COLOR)
+            else:
+                square = canvas.create_rectangle(*cell_rect(x, y), fill=SNAKE_COLOR, tag="snake")
+                self.squares.append(square)
 
-        canvas.delete("Food")
-        food = Food(snake)
+class Food:
+    def __init__(self, game):
+        if RENDERER == "image":
+            board.fill(*game.food, FOOD_COLOR)
+        else:
+            self.item = canvas.create_rectangle(*cell_rect(*game.food), fill=FOOD_COLOR, tag="Food")
+
+    def place(self, game):
+        if RENDERER == "image":
+            board.fill(*game.food, FOOD_COLOR)
+        else:
+            canvas.coords(self.item, *cell_rect(*game.food))
+
+def clear_canvas():
+    if RENDERER == "image":
+        canvas.delete("game_over")
+        board.clear()
+        board.show(True)
     else:
-        del snake.coordinates[-1]
-        canvas.delete(snake.squares[-1])
-        del snake.squares[-1]
-
-    if check_collisions(snake):
-        game_over()
+        canvas.delete(ALL)
+
+
+
+def step(snake, food):
+    # Advances the game one tick and redraws what changed; returns the food and None, or the end-of-game message
+    game = snake.game
+    if autopilot is not None:
+        game.turn(autopilot.choose(game))
+    tail = game.coordinates[-1]
+    event = game.step()
+    if event == DIED:
+        return food, "GAME OVER"
+    ate = event != MOVED
+    x, y = game.coordinates[0]
+
+    # Canvas changes for the tick are issued together; Tk redraws them once when idle
+    if RENDERER == "image":
+        # The tail's cell may still hold a segment: the body starts stacked, and the head can follow the tail
+        if not ate and tail not in game.occupied:
+            board.fill(*tail, BACKGROUND_COLOR)
+        board.fill(x, y, SNAKE_COLOR)
     else:
-        window.after(SPEED, lambda: next_turn(snake, food))
+        # Growing creates the new head's item, otherwise the tail's item moves to the head
+        if ate or RENDERER == "create":
+            square = canvas.create_rectangle(*cell_rect(x, y), fill=SNAKE_COLOR)
+            if not ate:
+                canvas.delete(snake.squares.pop())
+        else:
+            square = snake.squares.pop()
+            canvas.coords(square, *cell_rect(x, y))
+        snake.squares.appendleft(square)
+
+    if ate:
+        label.config(text=score_text())
+
+        if event == WON:
+            return food, "YOU WIN"
+        if RENDERER == "create":
+            canvas.delete("Food")
+            food = Food(game)
+        else:
+            food.place(game)
+
+    return food, None
+
+def score_text():
+    if autopilot is None:
+        return "Score:{}".format(game.score)
+    # Worst planning time so far against the per-tick budget
+    stats = autopilot.stats()
+    return "Score:{} auto {:.1f}/{:g}ms".format(game.score, stats["max_ms"], stats["budget_ms"])
+
+def tick_interval():
+    return max(MIN_SPEED, SPEED * SPEED_UP ** game.score) / 1000
+
+def start_ticks(snake, food):
+    global next_deadline
+    tick_stats.reset()
+    next_deadline = time.perf_counter()
+    next_turn(snake, food)
 
+def next_turn(snake, food):
+    # Ticks are due at absolute deadlines on a monotonic clock, so the time spent stepping and
+    # Tk's callback latency shift one tick at most instead of accumulating into drift
+    global next_deadline
+    now = time.perf_counter()
+    steps = 0
+    while now >= next_deadline:
+        if steps == MAX_CATCH_UP:
+            # Too far behind (the window was dragged, the machine stalled): skip the missed ticks
+            tick_stats.dropped += 1
+            next_deadline = now
+            break
+        tick_stats.record(now - next_deadline)
+        if steps:
+            tick_stats.catch_up += 1
+        food, result = step(snake, food)
+        if result:
+            game_over(result)
+            return food
+        next_deadline += tick_interval()
+        steps += 1
+        now = time.perf_counter()
+
+    delay = max(0, int((next_deadline - time.perf_counter()) * 1000))
+    window.after(delay, lambda: next_turn(snake, food))
     return food
 
 def change_direction(new_direction):
-    global direction
-    opposites = {"left": "right", "right": "left", "up": "down", "down": "up"}
-    if direction != opposites.get(new_direction):
-        direction = new_direction
-
-def check_collisions(snake):
-    x, y = snake.coordinates[0]
-    if x < 0 or x >= GAME_WIDTH or y < 0 or y >= GAME_HEIGHT:
-        return True
-    return any(x == part[0] and y == part[1] for part in snake.coordinates[1:])
+    if autopilot is None:
+        game.turn(new_direction)
+
+def toggle_autopilot():
+    global autopilot
+    if autopilot is None:
+        pilot = Autopilot(pilot_budget)
+        # Builds the distance field now rather than in the next tick's budget
+        pilot.reset(game)
+        autopilot = pilot
+    else:
+        autopilot = None
+    label.config(text=score_text())
 
 def restart_game():
-    global score, direction, snake, food
+    global snake, food
 
     retry_button.destroy()
 
-    score = 0
-    direction = 'down'
+    game.reset()
+    if autopilot is not None:
+        autopilot.reset_stats()
+        autopilot.reset(game)
 
-    label.config(text="Score:{}".format(score))
-    canvas.delete(ALL)
+    label.config(text=score_text())
+    clear_canvas()
 
-    snake = Snake()
-    food = Food(snake)
-    next_turn(snake, food)
+    snake = Snake(game)
+    food = Food(game)
+    start_ticks(snake, food)
 
 
-def game_over():
-    canvas.delete(ALL)
+def game_over(text="GAME OVER"):
+    if print_tick_stats:
+        print(tick_stats.summary())
+        if autopilot is not None:
+            print(autopilot.stats())
+    if RENDERER == "image":
+        # Kept for the next game
+        board.show(False)
+    else:
+        canvas.delete(ALL)
     canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2 - 40,
-                       font=('consolas', 40), text="GAME OVER", fill="white", tag="game_over")
+                       font=('consolas', 40), text=text, fill="white", tag="game_over")
 
     retry_button = Button(window, text="Retry", font=('consolas', 20), command=restart_game)
 
@@ -117,20 +269,22 @@ def game_over():
 
 
 def start_game():
-    global window, canvas, label, direction, score
+    global window, canvas, label, game, snake, food, board
 
     window = Tk()
     window.title("Snake Game")
     window.resizable(False, False)
 
-    score = 0
-    direction = 'down'
+    # All game rules live in snakeSim; this module only draws the game and schedules its ticks
+    game = Game(COLUMNS, ROWS, BODY_PARTS)
 
-    label = Label(window, text=f"Score: {score}", font=('consolas', 30))
+    label = Label(window, text=score_text(), font=('consolas', 30))
     label.pack()
 
     canvas = Canvas(window, bg=BACKGROUND_COLOR, height=GAME_HEIGHT, width=GAME_WIDTH)
     canvas.pack()
+    if RENDERER == "image":
+        board = Board()
 
     window.update()
     window_width = window.winfo_width()
@@ -147,13 +301,32 @@ def start_game():
     window.bind('<Right>', lambda event: change_direction('right'))
     window.bind('<Up>', lambda event: change_direction('up'))
     window.bind('<Down>', lambda event: change_direction('down'))
+    window.bind('<a>', lambda event: toggle_autopilot())
 
-    snake = Snake()
-    food = Food(snake)
+    snake = Snake(game)
+    food = Food(game)
 
-    next_turn(snake, food)
+    start_ticks(snake, food)
 
     window.mainloop()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snake")
+    parser.add_argument("--speed-up", type=float, default=SPEED_UP, help="tick interval multiplier per point scored")
+    parser.add_argument("--tick-stats", action="store_true", help="print tick lateness statistics at the end of each game")
+    parser.add_argument("--columns", type=int, default=COLUMNS)
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--cell-size", type=int, default=SPACE_SIZE, help="pixels per cell")
+    parser.add_argument("--large", action="store_true", help="{}x{} grid of {} px cells".format(*LARGE_GRID))
+    parser.add_argument("--renderer", choices=("image", "recycle", "create"), default=RENDERER)
+    parser.add_argument("--pilot-budget", type=float, default=BUDGET * 1000, help="autopilot planning time per tick, ms")
+    args = parser.parse_args()
+    SPEED_UP = args.speed_up
+    print_tick_stats = args.tick_stats
+    pilot_budget = args.pilot_budget / 1000
+    RENDERER = args.renderer
+    if args.large:
+        configure_grid(*LARGE_GRID)
+    else:
+        configure_grid(args.columns, args.rows, args.cell_size)
     start_game()
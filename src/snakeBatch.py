@@ -0,0 +1,97 @@
+import numpy as np
+
+from snakeSim import COLUMNS, ROWS, BODY_PARTS, DIRECTIONS, MOVED, ATE, DIED, WON
+
+# Direction indices in DIRECTIONS order, for BatchGame actions
+DX = np.array([0, 0, -1, 1])
+DY = np.array([-1, 1, 0, 0])
+OPPOSITE_INDEX = np.array([1, 0, 3, 2])
+
+
+class BatchGame:
+    # n independent games stepped together with array operations. Each game keeps a cell
+    # occupancy grid and its body as a ring buffer of cell indices (y * columns + x).
+    # Games that end are reset at the end of the step that ended them.
+    def __init__(self, n, columns=COLUMNS, rows=ROWS, body_parts=BODY_PARTS, seed=None):
+        self.n = n
+        self.columns = columns
+        self.rows = rows
+        self.cells = columns * rows
+        self.body_parts = body_parts
+        self.rng = np.random.default_rng(seed)
+        # A body never holds more than every cell plus the segments still stacked at the start
+        self.capacity = self.cells + body_parts
+        self.games = np.arange(n)
+
+        self.grid = np.zeros((n, self.cells), dtype=np.int16)
+        self.body = np.zeros((n, self.capacity), dtype=np.int32)
+        self.head_index = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.head_x = np.zeros(n, dtype=np.int64)
+        self.head_y = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.food = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        # Score of each game's last finished round
+        self.final_score = np.zeros(n, dtype=np.int64)
+        self.reset(self.games)
+
+    def reset(self, games):
+        self.grid[games] = 0
+        self.grid[games, 0] = self.body_parts
+        self.body[games, :self.body_parts] = 0
+        self.head_index[games] = self.body_parts - 1
+        self.length[games] = self.body_parts
+        self.head_x[games] = 0
+        self.head_y[games] = 0
+        self.direction[games] = DIRECTIONS.index("down")
+        self.score[games] = 0
+        # Only cell 0 is covered, so any other cell is a uniform free-cell draw
+        self.food[games] = self.rng.integers(1, self.cells, size=len(games))
+
+    def step(self, actions=None):
+        # actions: direction index per game (see DIRECTIONS), or None to keep going straight.
+        # Returns each game's event for this step.
+        games = self.games
+        if actions is not None:
+            actions = np.asarray(actions)
+            self.direction = np.where(actions != OPPOSITE_INDEX[self.direction], actions, self.direction)
+
+        x = self.head_x + DX[self.direction]
+        y = self.head_y + DY[self.direction]
+        inside = (x >= 0) & (x < self.columns) & (y >= 0) & (y < self.rows)
+        cell = np.where(inside, y * self.columns + x, 0)
+        ate = inside & (cell == self.food)
+
+        # Tail leaves before the head arrives, so following the tail is safe
+        moving = inside & ~ate
+        tail = self.body[games, (self.head_index - self.length + 1) % self.capacity]
+        self.grid[games[moving], tail[moving]] -= 1
+        self.length += ate
+
+        live = games[inside]
+        self.head_index[live] = (self.head_index[live] + 1) % self.capacity
+        self.body[live, self.head_index[live]] = cell[inside]
+        self.grid[live, cell[inside]] += 1
+        self.head_x = x
+        self.head_y = y
+
+        died = ~inside | (self.grid[games, cell] > 1)
+        events = np.where(died, DIED, np.where(ate, ATE, MOVED))
+
+        eaters = games[ate]
+        if len(eaters):
+            self.score[eaters] += 1
+            # Uniform draw among each eater's free cells: the k-th empty cell of its grid
+            free = self.grid[eaters] == 0
+            counts = free.sum(axis=1)
+            won = counts == 0
+            k = (self.rng.random(len(eaters)) * counts).astype(np.int64)
+            self.food[eaters] = np.argmax(free.cumsum(axis=1) > k[:, None], axis=1)
+            events[eaters[won]] = WON
+
+        finished = games[events >= DIED]
+        if len(finished):
+            self.final_score[finished] = self.score[finished]
+            self.reset(finished)
+        return events
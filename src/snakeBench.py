@@ -0,0 +1,223 @@
+import argparse
+import random
+import time
+from tkinter import Tk, Canvas, Label
+
+import numpy as np
+
+import snake
+from snakeBatch import BatchGame
+from snakePilot import Autopilot
+from snakeSim import Game, DIRECTIONS, DIED
+
+
+def cycle_direction(c, r, columns, rows):
+    # Hamiltonian cycle over the board (needs an even row count): up column 0, then back and forth
+    # through the other columns row by row, so the snake can grow until it fills the board
+    if c == 0:
+        return "up" if r > 0 else "right"
+    if r % 2 == 0:
+        return "right" if c < columns - 1 else "down"
+    if c > 1 or r == rows - 1:
+        return "left"
+    return "down"
+
+
+def autopilot(game):
+    x, y = game.coordinates[0]
+    game.turn(cycle_direction(x, y, game.columns, game.rows))
+
+
+def new_game():
+    snake.clear_canvas()
+    snake.game.reset()
+    return snake.Snake(snake.game), snake.Food(snake.game)
+
+
+def run_ticks(ticks):
+    # Plays `ticks` steps as fast as possible, letting Tk redraw after each one as the game loop would;
+    # returns ms per tick over the first and the last tenth of the run
+    s, food = new_game()
+    times = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        autopilot(snake.game)
+        food, result = snake.step(s, food)
+        if result:
+            s, food = new_game()
+        snake.canvas.update_idletasks()
+        times.append(time.perf_counter() - start)
+
+    tenth = max(1, ticks // 10)
+    first = sum(times[:tenth]) / tenth * 1000
+    last = sum(times[-tenth:]) / tenth * 1000
+
+    # The id a new item gets shows how many items were ever created
+    last_id = snake.canvas.create_line(0, 0, 0, 0)
+    return ticks / sum(times), first, last, last_id, len(snake.canvas.find_all()) - 1
+
+
+def create_window(seed, body_parts=snake.BODY_PARTS):
+    snake.game = Game(snake.COLUMNS, snake.ROWS, body_parts, random.Random(seed))
+    window = Tk()
+    window.title("Snake benchmark")
+    snake.window = window
+    snake.label = Label(window, font=('consolas', 30))
+    snake.label.pack()
+    return window
+
+
+def create_canvas(window):
+    snake.canvas = Canvas(window, bg=snake.BACKGROUND_COLOR, height=snake.GAME_HEIGHT, width=snake.GAME_WIDTH)
+    snake.canvas.pack()
+    if snake.RENDERER == "image":
+        snake.board = snake.Board()
+    window.update()
+
+
+def bench_render(args):
+    # The body starts stacked on one cell, so --body-parts gives a long snake from the first tick
+    snake.configure_grid(args.columns, args.rows, args.cell_size)
+    print(f"{args.columns}x{args.rows} cells of {args.cell_size} px")
+    print(f"{'renderer':>10} {'body':>6} {'ticks/s':>9} {'first ms':>9} {'last ms':>8} {'item ids used':>14} {'live items':>11}")
+    for body_parts in args.body_parts:
+        window = create_window(args.seed, body_parts)
+        for renderer in args.renderers:
+            snake.RENDERER = renderer
+            create_canvas(window)
+
+            snake.game.rng.seed(args.seed)
+            rate, first, last, last_id, live = run_ticks(args.ticks)
+            print(f"{renderer:>10} {body_parts:>6} {rate:>9.0f} {first:>9.3f} {last:>8.3f} {last_id:>14} {live:>11}")
+            snake.canvas.destroy()
+        window.destroy()
+
+
+def bench_timing(args):
+    # Runs the real scheduler in Tk's event loop with the autopilot steering, then reports tick lateness
+    window = create_window(args.seed)
+    create_canvas(window)
+    snake.SPEED_UP = args.speed_up
+    snake.game_over = lambda text="GAME OVER": restart()
+
+    step = snake.step
+    intervals = []
+
+    def autopilot_step(s, food):
+        autopilot(s.game)
+        intervals.append(snake.tick_interval())
+        return step(s, food)
+
+    def restart():
+        s, food = new_game()
+        window.after_idle(lambda: snake.next_turn(s, food))
+
+    snake.step = autopilot_step
+    s, food = new_game()
+    start = time.perf_counter()
+    snake.start_ticks(s, food)
+    window.after(int(args.seconds * 1000), window.quit)
+    window.mainloop()
+    elapsed = time.perf_counter() - start
+
+    summary = snake.tick_stats.summary()
+    print(f"ticks: {len(intervals)} in {elapsed:.2f} s (scheduled {sum(intervals[:-1]):.2f} s)")
+    print(f"lateness mean {summary['mean_ms']:.2f} ms, p95 {summary['p95_ms']:.2f} ms, max {summary['max_ms']:.2f} ms")
+    print(f"catch-up ticks: {summary['catch_up']}, dropped: {summary['dropped']}")
+    window.destroy()
+
+
+def bench_sim(args):
+    # Game logic alone, no Tk: one pure-Python game, then NumPy batches, under a random policy
+    rng = random.Random(args.seed)
+    game = Game(args.columns, args.rows, rng=rng)
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        game.turn(rng.choice(DIRECTIONS))
+        if game.step() >= DIED:
+            game.reset()
+    elapsed = time.perf_counter() - start
+    print(f"{'games':>7} {'steps/s':>12}")
+    print(f"{'scalar':>7} {args.steps / elapsed:>12.0f}")
+
+    action_rng = np.random.default_rng(args.seed)
+    for n in args.batch:
+        batch = BatchGame(n, args.columns, args.rows, seed=args.seed)
+        ticks = max(1, args.steps // n)
+        actions = action_rng.integers(0, 4, size=(ticks, n))
+        start = time.perf_counter()
+        for tick in range(ticks):
+            batch.step(actions[tick])
+        elapsed = time.perf_counter() - start
+        print(f"{n:>7} {ticks * n / elapsed:>12.0f}")
+
+
+def bench_pilot(args):
+    # Autopilot planning time per tick on growing boards, against its fixed budget
+    print(f"budget {args.budget:g} ms per tick")
+    print(f"{'board':>9} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'over':>6} {'repairs':>8} {'games':>6} {'best':>6}")
+    for size in args.sizes:
+        game = Game(size, size, rng=random.Random(args.seed))
+        pilot = Autopilot(args.budget / 1000)
+        pilot.reset(game)
+        times = []
+        scores = []
+        for _ in range(args.ticks):
+            start = time.perf_counter()
+            direction = pilot.choose(game)
+            times.append(time.perf_counter() - start)
+            game.turn(direction)
+            if game.step() >= DIED:
+                scores.append(game.score)
+                game.reset()
+        scores.append(game.score)
+        times.sort()
+        stats = pilot.stats()
+        p50 = times[len(times) // 2] * 1000
+        p99 = times[int(0.99 * len(times))] * 1000
+        print(f"{f'{size}x{size}':>9} {p50:>7.3f} {p99:>7.3f} {stats['max_ms']:>7.2f} {stats['over_budget']:>6} "
+              f"{stats['repairs']:>8} {len(scores):>6} {max(scores):>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snake benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    render = subparsers.add_parser("render", help="renderer ticks/sec and ms per tick by grid size and snake length")
+    render.add_argument("--ticks", type=int, default=20000)
+    render.add_argument("--renderers", nargs="+", choices=("create", "recycle", "image"), default=["create", "recycle", "image"])
+    render.add_argument("--columns", type=int, default=snake.COLUMNS)
+    render.add_argument("--rows", type=int, default=snake.ROWS, help="even, for the autopilot's cycle")
+    render.add_argument("--cell-size", type=int, default=snake.SPACE_SIZE)
+    render.add_argument("--body-parts", type=int, nargs="+", default=[snake.BODY_PARTS],
+                        help="snake lengths to compare; use a grid with more cells, e.g. 200x200 and 3 5000")
+    render.add_argument("--seed", type=int, default=1)
+    render.set_defaults(func=bench_render)
+
+    timing = subparsers.add_parser("timing", help="tick lateness of the fixed-timestep scheduler")
+    timing.add_argument("--seconds", type=float, default=10)
+    timing.add_argument("--speed-up", type=float, default=0.97, help="tick interval multiplier per point scored")
+    timing.add_argument("--seed", type=int, default=1)
+    timing.set_defaults(func=bench_timing)
+
+    sim = subparsers.add_parser("sim", help="headless game logic steps/sec, scalar and batched")
+    sim.add_argument("--steps", type=int, default=1000000, help="steps per measurement")
+    sim.add_argument("--batch", type=int, nargs="+", default=[100, 1000, 10000])
+    sim.add_argument("--columns", type=int, default=12)
+    sim.add_argument("--rows", type=int, default=12)
+    sim.add_argument("--seed", type=int, default=1)
+    sim.set_defaults(func=bench_sim)
+
+    pilot = subparsers.add_parser("pilot", help="autopilot planning time per tick on large boards")
+    pilot.add_argument("--ticks", type=int, default=20000)
+    pilot.add_argument("--sizes", type=int, nargs="+", default=[12, 50, 100, 200])
+    pilot.add_argument("--budget", type=float, default=2.0, help="planning budget per tick, ms")
+    pilot.add_argument("--seed", type=int, default=1)
+    pilot.set_defaults(func=bench_pilot)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+import time
+from collections import deque
+from functools import lru_cache
+
+from snakeSim import STEPS
+
+# Seconds of planning per tick; half goes to the distance field, the rest to the safety check
+BUDGET = 0.002
+
+UNKNOWN = 1 << 30
+
+
+@lru_cache(maxsize=None)
+def neighbour_table(columns, rows):
+    table = []
+    for i in range(columns * rows):
+        x, y = i % columns, i // columns
+        table.append([(y + dy) * columns + x + dx for dx, dy in STEPS.values()
+                      if 0 <= x + dx < columns and 0 <= y + dy < rows])
+    return table
+
+
+class Autopilot:
+    # Steers a snakeSim.Game towards its food down a BFS distance field measured from the food.
+    # The field is kept between ticks: values up to self.limit are exact, and each tick only the
+    # cells the head and tail changed are repaired. A head entering a cell at distance d can only
+    # lengthen paths that went through it, so the exact region shrinks to d without touching
+    # anything; a freed tail cell can only shorten paths, so the decrease is propagated from it.
+    # The BFS resumes from the limit only when the head's neighbours fall outside the exact region,
+    # and it can carry on over several ticks when the budget runs out.
+
+    def __init__(self, budget=BUDGET):
+        self.budget = budget
+        self.game = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.ticks = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+        self.over_budget = 0
+        self.rebuilds = 0
+        self.repairs = 0
+
+    def stats(self):
+        return {
+            "ticks": self.ticks,
+            "budget_ms": self.budget * 1000,
+            "mean_ms": self.total_time / self.ticks * 1000 if self.ticks else 0,
+            "max_ms": self.max_time * 1000,
+            "last_ms": self.last_time * 1000,
+            "over_budget": self.over_budget,
+            "rebuilds": self.rebuilds,
+            "repairs": self.repairs,
+        }
+
+    def reset(self, game):
+        self.game = game
+        self.columns = game.columns
+        self.cells = cells = game.columns * game.rows
+        self.neighbours = neighbour_table(game.columns, game.rows)
+
+        self.head = game.coordinates[0]
+        self.tail = game.coordinates[-1]
+        self.length = len(game.coordinates)
+        self.blocked = bytearray(cells)
+        for cell in game.occupied:
+            # A head that died off the edge is not on the board
+            if 0 <= cell[0] < game.columns and 0 <= cell[1] < game.rows:
+                self.blocked[self.index(cell)] = self.is_blocked(cell)
+        self.rebuild()
+
+    def index(self, cell):
+        return cell[1] * self.columns + cell[0]
+
+    def is_blocked(self, cell):
+        # The tail moves off its cell on the next step, so the head may follow it there
+        count = self.game.occupied.get(cell, 0)
+        return count > (cell == self.game.coordinates[-1])
+
+    def rebuild(self):
+        # New food: every distance changes
+        self.rebuilds += 1
+        self.dist = [UNKNOWN] * self.cells
+        self.food = self.game.food
+        self.hungry = 0
+        food = self.index(self.food)
+        self.dist[food] = 0
+        self.layers = [[food]]
+        self.limit = 0
+        self.frontier = None
+
+    def assign(self, cell, d):
+        self.dist[cell] = d
+        while len(self.layers) <= d:
+            self.layers.append([])
+        self.layers[d].append(cell)
+
+    def sync(self, game, deadline):
+        head, tail = game.coordinates[0], game.coordinates[-1]
+        if (game is not self.game or len(game.coordinates) < self.length
+                or abs(head[0] - self.head[0]) + abs(head[1] - self.head[1]) != 1):
+            self.reset(game)
+            return
+
+        # Only these cells can have changed since the last tick; blocks first so a freed cell
+        # never takes its distance from a neighbour that is about to be blocked
+        changes = []
+        for cell in {self.head, self.tail, head, tail}:
+            if 0 <= cell[0] < game.columns and 0 <= cell[1] < game.rows:
+                i = self.index(cell)
+                blocked = self.is_blocked(cell)
+                if blocked != self.blocked[i]:
+                    changes.append((not blocked, i))
+        changes.sort()
+        self.head, self.tail, self.length = head, tail, len(game.coordinates)
+
+        if game.food != self.food:
+            for freed, i in changes:
+                self.blocked[i] = not freed
+            self.rebuild()
+            return
+        for freed, i in changes:
+            if freed:
+                self.unblock(i, deadline)
+            else:
+                self.block(i)
+
+    def block(self, i):
+        self.blocked[i] = 1
+        d = self.dist[i]
+        if d != UNKNOWN:
+            self.dist[i] = UNKNOWN
+            if d <= self.limit:
+                self.limit = d
+                self.frontier = None
+
+    def unblock(self, i, deadline):
+        self.blocked[i] = 0
+        dist, blocked, neighbours = self.dist, self.blocked, self.neighbours
+        limit = self.limit
+        best = min((dist[n] for n in neighbours[i] if not blocked[n] and dist[n] <= limit), default=UNKNOWN)
+        if best >= limit + 1:
+            return  # Outside the exact region; the BFS reaches it when it gets there
+
+        self.assign(i, best + 1)
+        queue = deque([i])
+        count = 0
+        while queue:
+            u = queue.popleft()
+            d = dist[u] + 1
+            if d > limit + 1:
+                continue
+            count += 1
+            if not count & 31 and time.perf_counter() > deadline:
+                # The queue runs in distance order, so everything up to dist[u] is already lowered
+                self.limit = dist[u]
+                self.frontier = None
+                return
+            for n in neighbours[u]:
+                if not blocked[n] and dist[n] > d:
+                    self.assign(n, d)
+                    queue.append(n)
+
+    def extend(self, targets, deadline):
+        # Grows the exact region by BFS until one of targets is inside it or nothing more is
+        # reachable; returns False if the deadline came first, leaving the BFS to resume next tick
+        dist, blocked, neighbours, layers = self.dist, self.blocked, self.neighbours, self.layers
+        if self.frontier is None and self.limit < self.cells:
+            # Values beyond the limit may route through blocked cells: drop them, a layer at a time
+            # so a large field can take several ticks, and restart the BFS from the limit
+            self.repairs += 1
+            while len(layers) > self.limit + 1:
+                k = len(layers) - 1
+                for c in layers.pop():
+                    if dist[c] == k:
+                        dist[c] = UNKNOWN
+                if time.perf_counter() > deadline:
+                    return False
+            self.frontier = layers[self.limit] = [c for c in layers[self.limit] if dist[c] == self.limit]
+            layers.append([])
+            self.cursor = 0
+
+        count = 0
+        while not any(dist[t] <= self.limit for t in targets):
+            if self.limit >= self.cells:
+                return True
+            if self.cursor == len(self.frontier):
+                level = layers[self.limit + 1]
+                if not level:
+                    # Every reachable cell is measured
+                    self.limit = self.cells
+                    self.frontier = None
+                    return True
+                self.limit += 1
+                self.frontier = layers[self.limit] = [c for c in level if dist[c] == self.limit]
+                layers.append([])
+                self.cursor = 0
+                continue
+
+            u = self.frontier[self.cursor]
+            self.cursor += 1
+            d = dist[u] + 1
+            for n in neighbours[u]:
+                if not blocked[n] and dist[n] > d:
+                    dist[n] = d
+                    layers[d].append(n)
+            count += 1
+            if not count & 31 and time.perf_counter() > deadline:
+                return False
+        return True
+
+    def food_move(self, deadline):
+        options = [n for n in self.neighbours[self.index(self.head)] if not self.blocked[n]]
+        if not options or not self.extend(options, deadline):
+            return None
+        best = min(options, key=self.dist.__getitem__)
+        if self.dist[best] > self.limit:
+            return None  # Food unreachable
+        return best
+
+    def space(self, start, enough, deadline):
+        # Cells reachable from start, counting up to `enough`; reaching the tail, or running out of
+        # time in a region that big, counts as enough
+        tail = self.index(self.tail)
+        blocked, neighbours = self.blocked, self.neighbours
+        seen = {start}
+        queue = [start]
+        for count, u in enumerate(queue, 1):
+            if u == tail or len(seen) >= enough or (not count & 31 and time.perf_counter() > deadline):
+                return enough
+            for n in neighbours[u]:
+                if n not in seen and not blocked[n]:
+                    seen.add(n)
+                    queue.append(n)
+        return len(seen)
+
+    def safe_move(self, deadline):
+        # Tail-following fallback: the move that keeps the tail reachable or, failing that, leaves the most room
+        best, best_space = None, -1
+        for n in self.neighbours[self.index(self.head)]:
+            if not self.blocked[n]:
+                space = self.space(n, self.length, deadline)
+                if space > best_space:
+                    best, best_space = n, space
+        return best
+
+    def choose(self, game):
+        # Direction for the game's next step
+        start = time.perf_counter()
+        deadline = start + self.budget
+        self.sync(game, start + self.budget / 4)
+
+        move = self.food_move(start + self.budget / 2)
+        self.hungry += 1
+        # Eating there could leave too little room: stall behind the tail instead, though not for
+        # longer than it takes to tour the board, as a stalling policy can orbit the same loop forever
+        if move is not None and self.hungry <= self.cells and self.space(move, self.length, deadline) < self.length:
+            move = None
+        if move is None:
+            move = self.safe_move(deadline)
+
+        elapsed = time.perf_counter() - start
+        self.ticks += 1
+        self.total_time += elapsed
+        self.last_time = elapsed
+        self.max_time = max(self.max_time, elapsed)
+        if elapsed > self.budget:
+            self.over_budget += 1
+
+        if move is None:
+            return game.direction  # Boxed in
+        dx = move % self.columns - self.head[0]
+        dy = move // self.columns - self.head[1]
+        for direction, step in STEPS.items():
+            if step == (dx, dy):
+                return direction
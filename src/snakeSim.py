@@ -0,0 +1,126 @@
+import random
+from collections import deque
+
+COLUMNS = 12
+ROWS = 12
+BODY_PARTS = 3
+
+DIRECTIONS = ("up", "down", "left", "right")
+OPPOSITES = {"left": "right", "right": "left", "up": "down", "down": "up"}
+STEPS = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+
+# What a step did
+MOVED = 0
+ATE = 1
+DIED = 2
+WON = 3
+
+
+class FreeCells:
+    # Cells not covered by the snake, in a list for O(1) uniform sampling and a
+    # cell -> list index map so removal can swap the last cell into the gap
+    def __init__(self, cells):
+        self.cells = list(cells)
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def add(self, cell):
+        self.index[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def remove(self, cell):
+        i = self.index.pop(cell)
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[i] = last
+            self.index[last] = i
+
+    def choice(self, rng):
+        return rng.choice(self.cells)
+
+
+class Game:
+    # One game on a columns x rows grid, in cell coordinates; no display involved
+    def __init__(self, columns=COLUMNS, rows=ROWS, body_parts=BODY_PARTS, rng=None):
+        self.columns = columns
+        self.rows = rows
+        self.body_parts = body_parts
+        self.rng = rng if rng is not None else random.Random()
+        self.reset()
+
+    def reset(self):
+        self.direction = "down"
+        self.score = 0
+        self.result = None
+        # Head first; deques make adding the head and dropping the tail O(1)
+        self.coordinates = deque()
+        # Segments per cell, so collision and food placement tests are O(1); a count rather
+        # than a set because the body starts stacked on one cell
+        self.occupied = {}
+        self.free = FreeCells((x, y) for x in range(self.columns) for y in range(self.rows))
+
+        for _ in range(self.body_parts):
+            self.add_tail(0, 0)
+        self.food = self.free.choice(self.rng)
+
+    def turn(self, direction):
+        if self.direction != OPPOSITES.get(direction):
+            self.direction = direction
+
+    def add_tail(self, x, y):
+        self.coordinates.append((x, y))
+        self.occupy((x, y))
+
+    def add_head(self, x, y):
+        self.coordinates.appendleft((x, y))
+        self.occupy((x, y))
+
+    def occupy(self, cell):
+        count = self.occupied.get(cell, 0)
+        # A head that left the board was never a free cell
+        if not count and cell in self.free.index:
+            self.free.remove(cell)
+        self.occupied[cell] = count + 1
+
+    def remove_tail(self):
+        cell = self.coordinates.pop()
+        count = self.occupied[cell] - 1
+        if count:
+            self.occupied[cell] = count
+        else:
+            del self.occupied[cell]
+            self.free.add(cell)
+
+    def step(self):
+        # Returns MOVED, ATE, DIED or WON; after DIED or WON the game needs a reset()
+        dx, dy = STEPS[self.direction]
+        x, y = self.coordinates[0]
+        x += dx
+        y += dy
+
+        self.add_head(x, y)
+        if (x, y) != self.food:
+            self.remove_tail()
+            event = MOVED
+        else:
+            self.score += 1
+            if not self.free:
+                # The snake covers every cell: nowhere left for food
+                self.result = WON
+                return WON
+            self.food = self.free.choice(self.rng)
+            event = ATE
+
+        if self.collides():
+            self.result = DIED
+            return DIED
+        return event
+
+    def collides(self):
+        x, y = self.coordinates[0]
+        if x < 0 or x >= self.columns or y < 0 or y >= self.rows:
+            return True
+        # The head is counted too, so any other segment on its cell makes the count above one
+        return self.occupied[(x, y)] > 1